@@ -1,14 +1,94 @@
 """Main driver for stellar evolution manager"""
 
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 import argparse
+import logging
 import os
 import sys
 from pathlib import Path
 
 from stevma.io import load_yaml, logger
-from stevma.meshgrid import check_for_valid_namelist_options, create_meshgrid_from_dict
+
+# module-level parser singleton. built lazily by `init_parser` so it is only constructed once
+# per process no matter how many Manager objects are created
+_PARSER: Optional[argparse.ArgumentParser] = None
+
+
+def init_parser() -> argparse.ArgumentParser:
+    """Initialize parser of arguments from the command line"""
+
+    global _PARSER
+
+    if _PARSER is not None:
+        return _PARSER
+
+    parser = argparse.ArgumentParser(
+        prog="run-manager",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="make a grid of MESAbinary (MESAbin2dco) runs",
+    )
+
+    parser.add_argument(
+        "-d",
+        "--debug",
+        action="store_true",
+        default=False,
+        dest="debug",
+        help="enable debug mode",
+    )
+
+    parser.add_argument(
+        "-C",
+        "--config-file",
+        dest="config_fname",
+        help="name of configuration file",
+    )
+
+    parser.add_argument(
+        "--show-log-name",
+        action="store_true",
+        default=False,
+        dest="log_fname",
+        help="display log filename and exit",
+    )
+
+    parser.add_argument(
+        "--show-database-name",
+        action="store_true",
+        default=False,
+        dest="database_fname",
+        help="display database filename and exit",
+    )
+
+    parser.add_argument(
+        "--list-grid",
+        action="store_true",
+        default=False,
+        dest="list_grid",
+        help="display grid list and exit",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=False,
+        dest="no_cache",
+        help="disable the on-disk cache of parsed MESA defaults",
+    )
+
+    parser.add_argument(
+        "-v",
+        "--visualize",
+        action="store_true",
+        default=False,
+        dest="visualize",
+        help="enable visualization of grid using matplotlib. EXPERIMENTAL: NOT READY TO USE",
+    )
+
+    _PARSER = parser
+
+    return parser
 
 
 class Manager:
@@ -55,68 +135,18 @@ class Manager:
         else:
             self.mesa_dir = mesa_dir
 
-        # load mesh of stellar evolution models
-        self.meshgrid: Dict[str, Any[str, int, float, bool]] = dict()
+        # load mesh of stellar evolution models. each element is a gridpoint whose position
+        # in the list is its identifier
+        self.meshgrid: List[Dict[str, Any]] = []
+
+        # parsed meshgrid file, filled lazily by `_load_meshgrid` so that repeated
+        # `set_meshgrid` calls (e.g. with different conditions) parse the YAML only once
+        self._meshgrid_config: Optional[Dict[str, Any]] = None
 
     def init_args(self) -> argparse.ArgumentParser:
         """Initialize parser of arguments from the command line"""
 
-        parser = argparse.ArgumentParser(
-            prog="run-manager",
-            formatter_class=argparse.ArgumentDefaultsHelpFormatter,
-            description="make a grid of MESAbinary (MESAbin2dco) runs",
-        )
-
-        parser.add_argument(
-            "-d",
-            "--debug",
-            action="store_true",
-            default=False,
-            dest="debug",
-            help="enable debug mode",
-        )
-
-        parser.add_argument(
-            "-C",
-            "--config-file",
-            dest="config_fname",
-            help="name of configuration file",
-        )
-
-        parser.add_argument(
-            "--show-log-name",
-            action="store_true",
-            default=False,
-            dest="log_fname",
-            help="display log filename and exit",
-        )
-
-        parser.add_argument(
-            "--show-database-name",
-            action="store_true",
-            default=False,
-            dest="database_fname",
-            help="display database filename and exit",
-        )
-
-        parser.add_argument(
-            "--list-grid",
-            action="store_true",
-            default=False,
-            dest="list_grid",
-            help="display grid list and exit",
-        )
-
-        parser.add_argument(
-            "-v",
-            "--visualize",
-            action="store_true",
-            default=False,
-            dest="visualize",
-            help="enable visualization of grid using matplotlib. EXPERIMENTAL: NOT READY TO USE",
-        )
-
-        return parser
+        return init_parser()
 
     def parse_args(self) -> argparse.Namespace:
         """Parse command line arguments"""
@@ -133,15 +163,22 @@ class Manager:
 
         # in case DEBUG flag is wanted
         if args.debug:
-            from logging import DEBUG
+            logger.setLevel("DEBUG")
+
+        # in case the on-disk cache of parsed MESA defaults is not wanted. imported here so
+        # that the mesa subsystem is only loaded when the flag is actually used (see the
+        # deferred import in `set_meshgrid`)
+        if args.no_cache:
+            from stevma.mesa import utils as mesa_utils
 
-            logger.setLevel(DEBUG)
+            mesa_utils.DISK_CACHE_ENABLED = False
 
-        # print cli arguments to log file
-        msg = "command line arguments are: "
-        for k, v in sorted(vars(args).items()):
-            msg += f"{k}={v} "
-        logger.debug(msg[:-1])
+        # print cli arguments to log file; sorting & joining only matter at DEBUG level
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "command line arguments are: %s",
+                " ".join(f"{k}={v}" for k, v in sorted(vars(args).items())),
+            )
 
         return args
 
@@ -159,6 +196,9 @@ class Manager:
     def _load_meshgrid(self) -> Any:
         """Load mesh of stellar evolution models from a file"""
 
+        if self._meshgrid_config is not None:
+            return self._meshgrid_config
+
         logger.info("loading file with mesh of stellar evolution models")
 
         fname = Path(self.config["Models"]["meshgrid_filename"])
@@ -167,9 +207,11 @@ class Manager:
             logger.critical(f"no such file found: {fname}")
             sys.exit(1)
 
-        return load_yaml(fname)
+        self._meshgrid_config = load_yaml(fname)
+
+        return self._meshgrid_config
 
-    def set_meshgrid(self, conditions: List[Callable[..., bool]] = []) -> None:
+    def set_meshgrid(self, conditions: Optional[List[Callable[..., bool]]] = None) -> None:
         """Create grid of evolutionary models
 
         Parameters
@@ -185,6 +227,10 @@ class Manager:
 
         logger.info("creating meshgrid of models")
 
+        # imported here so that short-circuit CLI paths (e.g. --show-log-name) do not pay for
+        # the mesa subsystem (and numpy) at startup
+        from stevma.meshgrid import check_for_valid_namelist_options, create_meshgrid_from_dict
+
         # get dict of parameters that will be changing in the grid, each key of the dict
         # corresponds to a certain namelist of the MESA source code
         model_grid: Dict[str, Dict[str, Any]] = self._load_meshgrid()
@@ -2,11 +2,12 @@
 Database module
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
 import os
 import sqlite3
 from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
 
 import numpy as np
@@ -28,8 +29,19 @@ class Database:
         bool: "INTEGER",
     }
 
-    def __init__(self, database_name: str = "", remove_database: bool = False) -> None:
-        logger.debug(f" Database: connecting to `{database_name}`")
+    # connection-time tuning for write-heavy use: WAL needs one fsync per commit instead of
+    # two, NORMAL sync is safe under WAL, and the temp store/cache keep sorts off disk
+    TUNING_PRAGMAS = (
+        "PRAGMA journal_mode=WAL;",
+        "PRAGMA synchronous=NORMAL;",
+        "PRAGMA temp_store=MEMORY;",
+        "PRAGMA cache_size=-65536;",
+    )
+
+    def __init__(
+        self, database_name: str = "", remove_database: bool = False, tune_connection: bool = True
+    ) -> None:
+        logger.debug(" Database: connecting to `%s`", database_name)
 
         # filename
         self.database_filename = database_name
@@ -48,13 +60,53 @@ class Database:
         except FileExistsError:
             pass
 
-        # only after trying to remove, create connection
-        self.connection = sqlite3.connect(database_name)
+        # only after trying to remove, create connection. isolation_level=None disables the
+        # driver's implicit BEGIN/COMMIT state machine: statements autocommit and batches are
+        # grouped explicitly through `transaction` instead
+        self.connection = sqlite3.connect(database_name, isolation_level=None)
         self.cursor = self.connection.cursor()
+        self._closed = False
+
+        if tune_connection:
+            for pragma in self.TUNING_PRAGMAS:
+                self.cursor.execute(pragma)
+
+        # INSERT statements keyed by (table, column tuple): repeated inserts of the same row
+        # shape reuse one string, letting sqlite3 keep its compiled statement hot
+        self._insert_sql_cache: Dict[Tuple[str, Tuple[str, ...]], str] = dict()
 
     def commit(self) -> None:
         self.connection.commit()
 
+    def _insert_sql(self, table_name: str, columns: Tuple[str, ...]) -> str:
+        """Build (or reuse) the parameterized INSERT statement for a given row shape"""
+
+        key = (table_name, columns)
+        sql = self._insert_sql_cache.get(key)
+        if sql is None:
+            placeholders = ", ".join("?" * len(columns))
+            sql = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders});"
+            self._insert_sql_cache[key] = sql
+        return sql
+
+    @contextmanager
+    def transaction(self):
+        """Group several statements into one transaction (one fsync)
+
+        Use as `with db.transaction(): ...` around loops of inserts/updates, passing
+        `commit=False` to each call; SQLite then commits everything at once instead of
+        syncing to disk per row. Rolls back if the block raises
+        """
+
+        self.cursor.execute("BEGIN IMMEDIATE;")
+        try:
+            yield self
+        except Exception:
+            self.connection.rollback()
+            raise
+        else:
+            self.commit()
+
     def remove_database(self):
         try:
             os.remove(self.database_filename)
@@ -66,83 +118,124 @@ class Database:
             raise e
 
     def create_table(
-        self, table_name: str = "", table_data_dict: Dict[Any, Any] = OrderedDict()
+        self,
+        table_name: str = "",
+        table_data_dict: Dict[Any, Any] = OrderedDict(),
+        commit: bool = True,
     ) -> None:
-        logger.debug(f" Database: creating table `{table_name}`")
-
-        sql: str = f"CREATE TABLE IF NOT EXISTS {table_name} ("
+        logger.debug(" Database: creating table `%s`", table_name)
 
         # table_data_dict contains keys for either a star (star1 and/or star2) as well as the binary
         # in order to produce a single table, we construct a new dictionary combining the other two
         # but changing the keys in the star* dicts in order to contain an identificator to the star
         # to which it corresponds
-        for key, value in table_data_dict.items():
-            sql += f"{key} {self.DTYPE_MAPPER[type(value)]}, "
-
-        # wrap up command with the final parenthesis
-        sql = sql[:-2]
-        sql += ");"
+        columns = ", ".join(
+            f"{key} {self.DTYPE_MAPPER[type(value)]}" for key, value in table_data_dict.items()
+        )
+        sql: str = f"CREATE TABLE IF NOT EXISTS {table_name} ({columns});"
 
         self.execute(sql)
-        self.commit()
+        if commit:
+            self.commit()
+
+    def create_indexes(
+        self, table_name: str = "", column_names: Tuple[str, ...] = (), commit: bool = True
+    ) -> None:
+        """Create one index per column in `column_names`, if not already present
 
-    def drop_table(self, table_name: str = "") -> None:
-        logger.debug(f" Database: droping table `{table_name}`")
+        Bulk ingest is faster when the table carries no indexes, so callers should load
+        their rows first and build the lookup indexes afterwards
+        """
+        logger.debug(" Database: creating indexes on `%s` for %s", table_name, column_names)
+
+        for column_name in column_names:
+            sql: str = (
+                f"CREATE INDEX IF NOT EXISTS "
+                f"idx_{table_name}_{column_name} ON {table_name}({column_name});"
+            )
+            self.execute(sql)
+        if commit:
+            self.commit()
+
+    def drop_table(self, table_name: str = "", commit: bool = True) -> None:
+        logger.debug(" Database: droping table `%s`", table_name)
 
         sql: str = f"DROP TABLE IF EXISTS {table_name};"
         self.execute(sql)
-        self.commit()
+        if commit:
+            self.commit()
+
+    def insert_records(
+        self,
+        table_name: str = "",
+        table_data_rows: Optional[List[Dict[Any, Any]]] = None,
+    ) -> None:
+        """Insert many records into `table_name` within a single transaction
+
+        Parameters
+        ----------
+        table_name : `str`
+            Name of the table where rows will be appended
+
+        table_data_rows : `list`
+            List of dictionaries, one per record. All of them must share the same keys
+        """
+
+        if not table_data_rows:
+            return
+
+        logger.debug(" Database: inserting %d records into `%s`", len(table_data_rows), table_name)
+
+        # values are bound as parameters; only the table & column names go into the sql string
+        columns = list(table_data_rows[0].keys())
+        sql: str = self._insert_sql(table_name, tuple(columns))
+
+        rows = [tuple(row[column] for column in columns) for row in table_data_rows]
+
+        logger.debug("  executing sql command: '%s'", sql)
+        if self.connection.in_transaction:
+            # an enclosing `transaction` block handles the commit
+            self.cursor.executemany(sql, rows)
+        else:
+            with self.transaction():
+                self.cursor.executemany(sql, rows)
 
     def insert_record(
         self,
         table_name: str = "",
         table_data_dict: Dict[Any, Any] = OrderedDict(),
+        commit: bool = True,
     ) -> None:
 
-        logger.debug(f" Database: inserting record into table `{table_name}`")
-
-        # append row depending on the type of the value
-        sql: str = f"INSERT INTO {table_name}"
-        sql_column_names: str = "("
-        sql_column_values: str = "("
-        for key, value in table_data_dict.items():
-            if isinstance(value, str):
-                sql_column_names += f"{key}, "
-                sql_column_values += f"'{value}', "
-            else:
-                sql_column_names += f"{key}, "
-                sql_column_values += f"{value}, "
+        logger.debug(" Database: inserting record into table `%s`", table_name)
 
-        # write row to MESArun database
-        sql2: str = f"{sql} {sql_column_names[:-2]}) VALUES {sql_column_values[:-2]})"
+        # values are bound as parameters: sqlite reuses one prepared statement per shape
+        # instead of re-parsing a freshly concatenated string for every row
+        sql: str = self._insert_sql(table_name, tuple(table_data_dict.keys()))
 
         # commit insertion command to SQLITE database
-        self.execute(sql2)
-        self.commit()
+        self.execute(sql, tuple(table_data_dict.values()))
+        if commit:
+            self.commit()
 
     def update_record(
         self,
         table_name: str = "",
         table_data_dict: Dict[Any, Any] = OrderedDict(),
         model_id: int = -1,
+        commit: bool = True,
     ) -> None:
 
-        logger.debug(f" Database: updating record into table `{table_name}`")
-
-        # append row depending on the type of the value
-        sql: str = f"UPDATE {table_name} SET "
-        for key, value in table_data_dict.items():
-            if isinstance(value, str):
-                sql += f"{key} = '{value}', "
-            else:
-                sql += f"{key} = {value}, "
+        logger.debug(" Database: updating record into table `%s`", table_name)
 
-        # write row to MESArun database
-        sql = f"{sql[:-2]} WHERE model_id = {model_id};"
+        # values are bound as parameters (see `insert_record`)
+        assignments = ", ".join(f"{key} = ?" for key in table_data_dict)
+        sql: str = f"UPDATE {table_name} SET {assignments} WHERE model_id = ?;"
 
         # commit insertion command to SQLITE database
-        self.execute(sql)
-        self.commit()
+        self.execute(sql, (*table_data_dict.values(), model_id))
+        if commit:
+            self.commit()
 
     def get_id(self, table_name: str = "", model_name: str = "") -> int:
         """Get identifier of a MESA model
@@ -157,7 +250,7 @@ class Database:
         model_id : `int`
             Integer identifier of model_name
         """
-        logger.debug(f" Database: getting id for model `{model_name}`")
+        logger.debug(" Database: getting id for model `%s`", model_name)
 
         model_id = -1
 
@@ -170,33 +263,33 @@ class Database:
         return model_id
 
     def update_model_status(
-        self, table_name: str = "", model_name: str = "", status: str = ""
+        self, table_name: str = "", model_name: str = "", status: str = "", commit: bool = True
     ) -> None:
         """Update status of a MESA model"""
-        logger.debug(f" Database: updating status for model `{model_name}`")
+        logger.debug(" Database: updating status for model `%s`", model_name)
 
-        sql: str = f"UPDATE {table_name} SET status = '{status}' WHERE model_name = '{model_name}';"
+        sql: str = f"UPDATE {table_name} SET status = ? WHERE model_name = ?;"
 
         # commit insertion command to SQLITE database
-        self.execute(sql)
-        self.commit()
+        self.execute(sql, (status, model_name))
+        if commit:
+            self.commit()
 
     def model_present(self, model_id: int = -1, table_name: str = "") -> bool:
         """Find if model is present in `table_name`"""
-        logger.debug(f" Database: finding model presence with id `{model_id}`")
+        logger.debug(" Database: finding model presence with id `%s`", model_id)
 
         has_data: bool = False
 
+        # callers only use truthiness, so fetch a single constant from at most one row
+        # instead of every column of every matching row
         try:
-            row = self.fetch(
-                table_name=table_name, column_name="*", constraint=f"model_id = {model_id}"
-            )
-            if len(row) > 0:
-                has_data = True
+            self.execute(f"SELECT 1 FROM {table_name} WHERE model_id = ? LIMIT 1;", (model_id,))
+            has_data = self.cursor.fetchone() is not None
         except sqlite3.OperationalError:
             pass
 
-        logger.debug(f" Database: model with id `{model_id}` (has_data): {has_data}")
+        logger.debug(" Database: model with id `%s` (has_data): %s", model_id, has_data)
         return has_data
 
     def fetch(self, table_name: str = "", column_name: str = "*", constraint: str = "") -> Any:
@@ -207,7 +300,7 @@ class Database:
         else:
             sql += ";"
 
-        logger.debug(f"  fetching sql command: '{sql}'")
+        logger.debug("  fetching sql command: '%s'", sql)
 
         # execute command
         self.execute(sql)
@@ -215,23 +308,31 @@ class Database:
 
         return rows
 
-    def execute(self, sql: str = "") -> None:
-        logger.debug(f"  executing sql command: '{sql}'")
-        self.cursor.execute(sql)
+    def execute(self, sql: str = "", parameters: Tuple[Any, ...] = ()) -> None:
+        logger.debug("  executing sql command: '%s'", sql)
+        self.cursor.execute(sql, parameters)
 
-    def __del__(self):
-        try:
-            self.connection.close()
-        except Exception:
-            pass
+    def close(self) -> None:
+        """Close the connection explicitly (idempotent)
+
+        Preferred over relying on garbage collection: closing promptly flushes the WAL
+        checkpoint at a deterministic point instead of whenever the finalizer runs
+        """
+
+        if self._closed:
+            return
+        self.cursor.close()
+        self.connection.close()
+        self._closed = True
 
     def __enter__(self):
         return self
 
     def __exit__(self, ext_type, exc_value, traceback):
-        self.cursor.close()
+        if self._closed:
+            return
         if isinstance(exc_value, Exception):
             self.connection.rollback()
         else:
             self.commit()
-        self.connection.close()
+        self.close()
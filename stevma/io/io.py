@@ -1,7 +1,9 @@
 """Input/output module"""
 
-from typing import Any, Dict, Union
+from typing import Any, Dict, Tuple, Union
 
+import copy
+import os
 import re
 import sys
 from collections import OrderedDict
@@ -9,6 +11,17 @@ from pathlib import Path
 
 import yaml
 
+# prefer the libyaml C binding, which is ~10x faster than the pure-Python parser
+# (and, unlike FullLoader, does not allow arbitrary object instantiation)
+try:
+    from yaml import CSafeLoader as _YAMLLoader
+except ImportError:
+    from yaml import SafeLoader as _YAMLLoader  # type: ignore
+
+# parsed YAML files, keyed by (absolute path, mtime, size) so that a modified
+# file is re-parsed while repeated loads of the same file become a dict lookup
+_YAML_CACHE: Dict[Tuple[str, int, int], Any] = {}
+
 
 def load_yaml(fname: Union[str, Path]) -> Any:
     """Load configuration file with YAML format
@@ -26,8 +39,16 @@ def load_yaml(fname: Union[str, Path]) -> Any:
     if isinstance(fname, Path):
         fname = str(fname)
 
-    with open(fname) as f:
-        return yaml.load(f, Loader=yaml.FullLoader)
+    st = os.stat(fname)
+    key = (os.path.abspath(fname), st.st_mtime_ns, st.st_size)
+
+    if key not in _YAML_CACHE:
+        # read as bytes: libyaml accepts them directly, skipping an extra decode pass
+        with open(fname, "rb") as f:
+            _YAML_CACHE[key] = yaml.load(f, Loader=_YAMLLoader)
+
+    # callers are free to mutate what they get back, so never hand out the cached object
+    return copy.deepcopy(_YAML_CACHE[key])
 
 
 def progress_bar(
@@ -69,26 +90,44 @@ def progress_bar(
 
     """
 
-    # if msgs are longer than 15 characters, simply remove excess
+    # integer arithmetic is enough here: bar cells and tenths of a percent
+    bar_filled = (mark_count * count) // total
+    percent_tenths = (1000 * count) // total
+
+    # only repaint the terminal when something visible changed; for large grids most calls
+    # land on the same cell/percent and a write+flush per call dominates the loop
+    state = (bar_filled, percent_tenths, left_msg, right_msg)
+    if state == getattr(progress_bar, "_last_state", None):
+        return
+    progress_bar._last_state = state  # type: ignore[attr-defined]
+
+    # if msgs are longer than 30 characters, simply remove excess
     msg_left = left_msg if len(left_msg) <= 30 else left_msg[:30]
     msg_right = right_msg if len(right_msg) <= 30 else right_msg[:30]
 
-    bar_filled = int(round(mark_count * count / float(total)))
-    percent_str = str(round(100.0 * count / float(total), 1))
-    marked_progress = mark_char * (bar_filled + 1)
-    unmarked_progress = unmarked_char * (mark_count - bar_filled)
-    progress = marked_progress + unmarked_progress
+    percent_str = f"{percent_tenths / 10:.1f}"
+    progress = mark_char * bar_filled + unmarked_char * (mark_count - bar_filled)
 
     sys.stdout.write(f"\r{msg_left:<21} |{progress}| {percent_str:>6}% {msg_right:21}")
     sys.stdout.flush()
 
 
+# patterns used by the namelist parser, compiled once at import instead of per call
+_COMPLEX_RE = re.compile(r"^\((\d+.?\d*),(\d+.?\d*)\)$")
+_STRING_RE = re.compile(r"\'\s*\w[^']*\'")
+
+
 class NoSingleValueFoundException(Exception):
     """Class for handling exceptions"""
 
     pass
 
 
+# fortran spellings of the booleans
+_TRUE_VALUES = frozenset((".true.", "T"))
+_FALSE_VALUES = frozenset((".false.", "F"))
+
+
 def parse_fortran_value_to_python(value: str = "") -> Any:
     """Try to parse a single value, if no single value is matched it raises an exception
 
@@ -100,41 +139,60 @@ def parse_fortran_value_to_python(value: str = "") -> Any:
     -------
     value converted to python format
     """
-    complex_re = re.compile(r"^\((\d+.?\d*),(\d+.?\d*)\)$")
+    # dispatch on the kind of value instead of a try/except ladder: the old path paid one or
+    # two raised exceptions for every non-integer value, which dominated hot parse loops
+
+    # check for a boolean
+    if value in _TRUE_VALUES:
+        return True
+    if value in _FALSE_VALUES:
+        return False
+
+    first = value[:1]
+
+    # see if we have an escaped string
+    if first == "'" or first == '"':
+        if value.endswith(first) and value.count(first) == 2:
+            return value[1:-1]
+        raise NoSingleValueFoundException(value)
+
+    # check for complex number
+    if first == "(":
+        complex_values = _COMPLEX_RE.findall(value)
+        if len(complex_values) == 1:
+            a, b = complex_values[0]
+            return complex(float(a), float(b))
+        raise NoSingleValueFoundException(value)
+
     try:
-        parsed_value = int(value)
+        return int(value)
     except ValueError:
         try:
-            tmp = value.replace("d", "E")
-            parsed_value = float(tmp)  # type: ignore
+            # fortran floats may carry a `d` exponent
+            return float(value.replace("d", "E"))
         except ValueError:
-            # check for complex number
-            complex_values = re.findall(complex_re, value)
-            if len(complex_values) == 1:
-                a, b = complex_values[0]
-                parsed_value = complex(float(a), float(b))  # type: ignore
-            elif value in [".true.", "T"]:
-                # check for a boolean
-                parsed_value = True
-            elif value in [".false.", "F"]:
-                parsed_value = False
-            else:
-                # see if we have an escaped string
-                if value.startswith("'") and value.endswith("'") and value.count("'") == 2:
-                    parsed_value = value[1:-1]  # type: ignore
-                elif value.startswith('"') and value.endswith('"') and value.count('"') == 2:
-                    parsed_value = value[1:-1]  # type: ignore
-                else:
-                    raise NoSingleValueFoundException(value)
+            raise NoSingleValueFoundException(value)
 
-    return parsed_value
+
+# per-type fortran formatters, used for exact-type dispatch: one dict lookup replaces the
+# isinstance ladder on the hot emission path (bool needs its own entry since it subclasses int)
+_FORTRAN_FORMATTERS = {
+    bool: lambda value: ".true." if value else ".false.",
+    int: "{:d}".format,
+    float: lambda value: f"{value:.10e}".replace("e", "d"),
+    str: "'{}'".format,
+    complex: lambda value: f"({value.real:.5f},{value.imag:.5f})",
+}
 
 
 def parse_python_value_to_fortran(value):
     """Recieve a python friendly value and returns it into a fortran one"""
 
-    is_python2 = sys.version_info < (3, 0, 0)
+    formatter = _FORTRAN_FORMATTERS.get(type(value))
+    if formatter is not None:
+        return formatter(value)
 
+    # subclasses (e.g. numpy scalars) miss the exact-type table; check by isinstance
     if isinstance(value, bool):
         return value and ".true." or ".false."
 
@@ -147,9 +205,6 @@ def parse_python_value_to_fortran(value):
     elif isinstance(value, str):
         return f"'{value}'"
 
-    elif is_python2 and isinstance(value, str):  # needed if unicode literals are used
-        return f"'{value}'"
-
     elif isinstance(value, complex):
         return "({:.5f},{:.5f})".format(
             value.real,
@@ -160,6 +215,60 @@ def parse_python_value_to_fortran(value):
         raise Exception(f"Variable type not understood: {type(value)}")
 
 
+def _store_assignment(group: Dict[Any, Any], line: str) -> None:
+    """Parse a single `name = value` logical line and store it into `group`"""
+
+    # commas at the end of lines seem to be optional
+    if line.endswith(","):
+        line = line[:-1]
+
+    k, _, v = line.partition("=")
+    variable_name = k.strip()
+    variable_value = v.strip()
+
+    # array syntax, e.g. `xa(3) = ...`; cheap string checks instead of a regex
+    variable_index = None
+    if variable_name.endswith(")"):
+        open_paren = variable_name.rfind("(")
+        if open_paren != -1:
+            index_str = variable_name[open_paren + 1 : -1].strip()
+            if index_str.isdigit():
+                variable_index = int(index_str) - 1  # python indexing starts at 0
+                variable_name = variable_name[:open_paren].strip()
+
+    try:
+        parsed_value = parse_fortran_value_to_python(value=variable_value)
+
+        if variable_index is None:
+            group[variable_name] = parsed_value
+        else:
+            if variable_name not in group:
+                group[variable_name] = {"_is_list": True}
+            group[variable_name][variable_index] = parsed_value
+
+    except NoSingleValueFoundException:
+        # see we have several values inlined
+        if variable_value.count("'") in (0, 2):
+            if "(" in variable_value:  # if list of complex values
+                variable_arr_entries = variable_value.split()
+            else:
+                # replacing ',' makes comma-separated arrays possible,
+                # this fails if an array of complex numbers is comma-separated
+                variable_arr_entries = variable_value.replace(",", " ").split()
+        else:
+            # we need to be more careful with lines with escaped
+            # strings, since they might contained spaces
+            matches = _STRING_RE.findall(variable_value)
+            variable_arr_entries = [s.strip() for s in matches]
+
+        for variable_index, inline_value in enumerate(variable_arr_entries):
+            parsed_value = parse_fortran_value_to_python(value=inline_value)
+
+            if variable_name not in group:
+                group[variable_name] = {"_is_list": True}
+            group[variable_name][variable_index] = parsed_value
+
+
 def namelist_string_to_dict(buffer: str = "") -> Dict[Any, Any]:
     """From a string containing a fortran namelist, group elements of it into a dictionary
 
@@ -180,112 +289,58 @@ def namelist_string_to_dict(buffer: str = "") -> Dict[Any, Any]:
         raise ValueError("`buffer` argument is empty")
 
     namelists = OrderedDict()
+    group_cnt: Dict[Any, Any] = dict()
 
-    # allow blocks to span multiple lines
-    group_re = re.compile(r"&([^&]+)/")
-    array_re = re.compile(r"(\w+)\((\d+)\)")
-    string_re = re.compile(r"\'\s*\w[^']*\'")
-    # complex_re = re.compile(r"^\((\d+.?\d*),(\d+.?\d*)\)$")
+    # single pass over the lines with a tiny state machine: `&name` opens a group, `/`
+    # closes it. the old implementation re-scanned the whole buffer several times
+    # (comment filter, rejoin, group regex, per-block resplit, per-line regex)
+    group_name = None
+    group: Dict[Any, Any] = OrderedDict()
+    pending = None  # logical line being assembled (handles trailing-comma continuations)
 
-    # do not use lines with comments ("!")
-    filtered_lines = []
-    for line in buffer.split("\n"):
-        if line.strip().startswith("!"):
+    for raw_line in buffer.splitlines():
+        line = raw_line.strip()
+        if line == "" or line.startswith("!"):
             continue
-        else:
-            filtered_lines.append(line)
 
-    group_blocks = re.findall(group_re, "\n".join(filtered_lines))
-    group_cnt: Dict[Any, Any] = dict()
-    for group_block in group_blocks:
-        block_lines_raw = group_block.split("\n")
-        group_name = block_lines_raw.pop(0).strip()
-
-        group = OrderedDict()
-        block_lines = []
-        for line in block_lines_raw:
-            # cleanup string
-            line = line.strip()
+        if group_name is None:
+            if line.startswith("&"):
+                group_name = line[1:].strip()
+                group = OrderedDict()
+            continue
+
+        # inline comments are allowed, but we remove them for now
+        if "!" in line:
+            line = line.partition("!")[0].strip()
             if line == "":
                 continue
-            if line.startswith("!"):
-                continue
-
-            try:
-                k, v = line.split("=")
-                block_lines.append(line)
-            except ValueError:
-                # no = in current line, try to append to previous line
-                if block_lines[-1].endswith(","):
-                    block_lines[-1] += line
-                else:
-                    raise
 
-        for line in block_lines:
-            # commas at the end of lines seem to be optional
-            if line.endswith(","):
-                line = line[:-1]
+        if line.startswith("/"):
+            # end of group
+            if pending is not None:
+                _store_assignment(group, pending)
+                pending = None
 
-            # inline comments are allowed, but we remove them for now
-            if "!" in line:
-                line = line.split("!")[0].strip()
-
-            k, v = line.split("=")
-            variable_name = k.strip()
-            variable_value = v.strip()
-
-            variable_name_groups = re.findall(array_re, k)
-
-            variable_index = None
-            if len(variable_name_groups) == 1:
-                variable_name, variable_index = variable_name_groups[0]
-                variable_index = int(variable_index) - 1  # python indexing starts at 0
-
-            try:
-                parsed_value = parse_fortran_value_to_python(value=variable_value)
-
-                if variable_index is None:
-                    group[variable_name] = parsed_value
-                else:
-                    if variable_name not in group:
-                        group[variable_name] = {"_is_list": True}
-                    group[variable_name][variable_index] = parsed_value
-
-            except NoSingleValueFoundException:
-                # see we have several values inlined
-                if variable_value.count("'") in [0, 2]:
-                    if variable_value.count("(") != 0:  # if list of complex values
-                        variable_arr_entries = variable_value.split()
-                    else:
-                        # replacing ',' makes comma-separated arrays possible,
-                        # see unit test test_inline_array_comma
-                        # this fails if an array of complex numbers is comma-separated
-                        variable_arr_entries = variable_value.replace(",", " ").split()
+            if group_name in group:
+                if group_name not in group_cnt:
+                    group_cnt[group_name] = 0
                 else:
-                    # we need to be more careful with lines with escaped
-                    # strings, since they might contained spaces
-                    matches = re.findall(string_re, variable_value)
-                    variable_arr_entries = [s.strip() for s in matches]
+                    group_cnt[group_name] += 1
+                group_name = group_name + str(group_cnt[group_name])
 
-                for variable_index, inline_value in enumerate(variable_arr_entries):
-                    parsed_value = parse_fortran_value_to_python(value=inline_value)
-
-                    # if variable_index is None:
-                    #     group[variable_name] = parsed_value
-                    # else:
-                    if variable_name not in group:
-                        group[variable_name] = {"_is_list": True}
-                    group[variable_name][variable_index] = parsed_value
-
-        if group_name in group.keys():
-
-            if group_name not in group_cnt.keys():
-                group_cnt[group_name] = 0
-            else:
-                group_cnt[group_name] += 1
-            group_name = group_name + str(group_cnt[group_name])
+            namelists[group_name] = group
+            group_name = None
+            continue
 
-        namelists[group_name] = group
+        if "=" in line:
+            if pending is not None:
+                _store_assignment(group, pending)
+            pending = line
+        elif pending is not None and pending.endswith(","):
+            # no = in current line, append to previous one
+            pending += line
+        else:
+            raise ValueError(f"cannot parse namelist line: `{raw_line}`")
 
     return namelists
 
@@ -57,6 +57,8 @@ LOGGING_CFG = {
             "backupCount": 3,
             "formatter": "long",  # "standard",
             "filename": LOG_FILENAME,
+            # do not open (and possibly rotate) the log file until something is emitted
+            "delay": True,
         },
         "console": {
             "level": "CRITICAL",
@@ -78,6 +80,11 @@ LOGGING_CFG = {
 }
 
 
+# set once the logging configuration has been applied, so re-imports (test harnesses,
+# subprocess workers) do not rebuild handlers and re-open the rotating log file
+_LOGGER_CONFIGURED = False
+
+
 def set_logger():
     """Build and return a logger
     Returns
@@ -85,13 +92,20 @@ def set_logger():
     logger : `Logger instance`
     """
 
+    global _LOGGER_CONFIGURED
+
     _logger = logging.getLogger()
 
+    if _LOGGER_CONFIGURED:
+        return _logger
+
     config = LOGGING_CFG
 
     # Load the configuration
     logging.config.dictConfig(config)
 
+    _LOGGER_CONFIGURED = True
+
     return _logger
 
 
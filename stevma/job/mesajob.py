@@ -21,6 +21,31 @@ class MESAJob:
        folder with cache used by MESA
     """
 
+    # script skeletons are identical for every job; they live at class scope so each call
+    # only pays for one %-substitution instead of rebuilding the literal piece by piece
+    _MESAINIT_TMPL = (
+        "\nmesainit () {\n"
+        '   export MESASDK_ROOT="%s"\n'
+        '   export MESA_DIR="%s"\n'
+        '   export MESA_CACHES_DIR="%s"\n'
+        "   source $MESASDK_ROOT/bin/mesasdk_init.sh\n"
+        "}\n"
+    )
+
+    _MAIN_LOOP_TMPL = (
+        "\n"
+        "mesainit\n\n"
+        "filename=$1\n"
+        "cd $MESA_RUNS_DIR\n"
+        "while read line; do\n"
+        "   dir=$line\n"
+        "   echo going to evolve the run inside: $dir\n"
+        "   cd $dir\n"
+        "   $MESA_TEMPLATE_DIR/%s | tee log\n"
+        "   cd $MESA_RUNS_DIR\n"
+        "done < $filename"
+    )
+
     def __init__(
         self,
         mesa_dir: Union[str, Path] = "",
@@ -29,48 +54,32 @@ class MESAJob:
         is_binary_evolution: bool = False,
     ) -> None:
 
-        # check if variables are OK
-        if mesa_dir == "" or mesa_dir is None:
-            if os.environ.get("MESA_DIR") is None:
-                raise ValueError("`MESA_DIR` is not present")
-
-        if mesasdk_dir == "" or mesasdk_dir is None:
-            if os.environ.get("MESASDK_ROOT") is None:
-                raise ValueError("`MESASDK_ROOT` is not present")
+        # mesa specific folders. they are only ever interpolated into shell scripts, so
+        # keep them as plain strings instead of round-tripping through Path; an empty
+        # argument falls back to the corresponding environment variable
+        self.mesa_dir = self._resolve_directory(mesa_dir, "MESA_DIR")
+        self.mesasdk_dir = self._resolve_directory(mesasdk_dir, "MESASDK_ROOT")
+        self.mesa_caches_dir = self._resolve_directory(mesa_caches_dir, "MESA_CACHES_DIR")
 
-        if mesa_caches_dir == "" or mesa_caches_dir is None:
-            if os.environ.get("MESA_CACHES_DIR") is None:
-                raise ValueError("`MESA_CACHES_DIR` is not present")
+        self.is_binary_evolution = is_binary_evolution
 
-        # mesa specific folders
-        if isinstance(mesa_dir, str):
-            self.mesa_dir = Path(mesa_dir)
-        else:
-            self.mesa_dir = mesa_dir
+    @staticmethod
+    def _resolve_directory(value: Union[str, Path], env_name: str) -> str:
+        """Return `value` as a string, falling back to the `env_name` environment variable"""
 
-        if isinstance(mesasdk_dir, str):
-            self.mesasdk_dir = Path(mesasdk_dir)
-        else:
-            self.mesasdk_dir = mesasdk_dir
+        if value:
+            return str(value)
 
-        if isinstance(mesa_caches_dir, str):
-            self.mesa_caches_dir = Path(mesa_caches_dir)
-        else:
-            self.mesa_caches_dir = mesa_caches_dir
+        env_value = os.environ.get(env_name)
+        if not env_value:
+            raise ValueError(f"`{env_name}` is not present")
 
-        self.is_binary_evolution = is_binary_evolution
+        return env_value
 
     def set_mesainit_string(self) -> str:
         """Create string to initialize MESA inside a shell script"""
 
-        string = "\nmesainit () {\n"
-        string += f'   export MESASDK_ROOT="{self.mesasdk_dir}"\n'
-        string += f'   export MESA_DIR="{self.mesa_dir}"\n'
-        string += f'   export MESA_CACHES_DIR="{self.mesa_caches_dir}"\n'
-        string += "   source $MESASDK_ROOT/bin/mesasdk_init.sh\n"
-        string += "}\n"
-
-        return string
+        return self._MESAINIT_TMPL % (self.mesasdk_dir, self.mesa_dir, self.mesa_caches_dir)
 
     def set_mesa_env_variables_string(
         self,
@@ -96,32 +105,19 @@ class MESAJob:
         template_directory = str(template_directory)
         runs_directory = str(runs_directory)
 
-        string = f"\nexport MESA_TEMPLATE_DIR={template_directory}\n"
-        string += f"export MESA_RUNS_DIR={runs_directory}\n"
+        parts = [
+            f"\nexport MESA_TEMPLATE_DIR={template_directory}\n",
+            f"export MESA_RUNS_DIR={runs_directory}\n",
+        ]
         if set_mesa_inlist:
-            string += f"export MESA_INLIST={template_directory}/inlist\n"
+            parts.append(f"export MESA_INLIST={template_directory}/inlist\n")
 
-        return string
+        return "".join(parts)
 
     def set_main_loop_string(self):
         """Create string with main loop of stellar evolution runs"""
 
         # get the name of the binary of MESA depending on the type of run
-        if self.is_binary_evolution:
-            binary_name = "binary"
-        else:
-            binary_name = "star"
-
-        string = "\n"
-        string += "mesainit\n\n"
-        string += "filename=$1\n"
-        string += "cd $MESA_RUNS_DIR\n"
-        string += "while read line; do\n"
-        string += "   dir=$line\n"
-        string += "   echo going to evolve the run inside: $dir\n"
-        string += "   cd $dir\n"
-        string += f"   $MESA_TEMPLATE_DIR/{binary_name} | tee log\n"
-        string += "   cd $MESA_RUNS_DIR\n"
-        string += "done < $filename"
-
-        return string
+        binary_name = "binary" if self.is_binary_evolution else "star"
+
+        return self._MAIN_LOOP_TMPL % binary_name
@@ -1,6 +1,11 @@
 """Module with shell job object"""
 
+import os
 import subprocess
+import sys
+from pathlib import Path
+
+from .slurmjob import SHELL_HEADER_TMPL
 
 
 class ShellJob:
@@ -15,20 +20,13 @@ class ShellJob:
         self.name = name
         self.command = command
 
+        # the header only depends on the name, so render it once here
+        self._shell_config = SHELL_HEADER_TMPL.format(name=self.name)
+
     def set_shell_config(self):
         """Configuration for shell job"""
 
-        string = "#!/bin/sh\n"
-        string += "\n"
-        string += "# This script was created by the STEVMA module\n"
-        string += "# to manually run the grid of stellar evolution\n"
-        string += "# models, give executable permissions to the script\n"
-        string += "# and then submit the desired models found in the\n"
-        string += "# different *.folders files using the shell script\n"
-        string += f"# with name: {self.name}\n"
-        string += f"# e.g.: `$ {self.name} job_0.folders`\n"
-
-        return string
+        return self._shell_config
 
     def write_job_to_file(self, fname: str = "") -> None:
         """Write job to a file
@@ -39,11 +37,10 @@ class ShellJob:
            Filename for the shell job.
         """
 
-        msg = self.set_shell_config()
-        msg += self.command
-
-        with open(fname, "w") as f:
-            f.write(msg)
+        # join once and write the whole script in a single call
+        Path(fname).write_text(self.set_shell_config() + self.command)
+        # make it executable now so submissions need no chmod at all
+        os.chmod(fname, os.stat(fname).st_mode | 0o111)
 
     def submit(self, fname: str = "", root_dir: str = "") -> None:
         """Submit Slurm job to queue
@@ -54,16 +51,18 @@ class ShellJob:
            Filename of the PBS job.
         """
         try:
+            # the executable bit was set when the job file was written
             p = subprocess.Popen(
-                f"chmod +x {fname}; ./{fname}",
-                shell=True,
-                executable="/bin/sh",
+                [f"./{fname}"],
                 cwd=root_dir,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
             )
-            stdout, stderr = p.communicate()
-            if stderr is not None:
-                print(f"WARNING: could not run shell job: {str(stderr)}")
+            # stream output as it is produced rather than buffering it all in communicate()
+            for line in p.stdout:  # type: ignore[union-attr]
+                sys.stdout.buffer.write(line)
+            p.wait()
+            if p.returncode != 0:
+                print(f"WARNING: could not run shell job: exit code {p.returncode}")
         except Exception as e:
             print(e)
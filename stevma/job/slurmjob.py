@@ -1,6 +1,36 @@
 """Module with Slurm job object"""
 
+import os
 import subprocess
+import sys
+from pathlib import Path
+
+# header skeletons shared by every job; formatted once per job at construction time.
+# SHELL_HEADER_TMPL is public because ShellJob renders the same header
+SHELL_HEADER_TMPL = (
+    "#!/bin/sh\n"
+    "\n"
+    "# This script was created by the STEVMA module\n"
+    "# to manually run the grid of stellar evolution\n"
+    "# models, give executable permissions to the script\n"
+    "# and then submit the desired models found in the\n"
+    "# different *.folders files using the shell script\n"
+    "# with name: {name}\n"
+    "# e.g.: `$ {name} job_0.folders`\n"
+)
+
+_SBATCH_TMPL = (
+    "#SBATCH -S /bin/bash\n"
+    "#SBATCH --job-name={name}\n"
+    "#SBATCH --out={out}\n"
+    "#SBATCH --partition {partition}\n"
+    "#SBATCH --mail-type={msg}\n"
+    "#SBATCH --mail-user={email}\n"
+    "#SBATCH --time={walltime}\n"
+    "#SBATCH --nodes={nodes} --cpus-per-task={ppn}\n"
+    "#SBATCH --mem={mem}gb\n"
+    '\nexport SCRATCH="/scratch/$USER.$PBS_JOBID"\n'
+)
 
 
 class SlurmJob:
@@ -70,34 +100,28 @@ class SlurmJob:
         if self.walltime == "" or self.walltime is None:
             self.walltime = "168:00:00"
 
+        # every field is known by now, so both blocks are rendered once and cached
+        self._shell_config = SHELL_HEADER_TMPL.format(name=self.name)
+        self._slurm_config = _SBATCH_TMPL.format(
+            name=self.name,
+            out=self.out_fname,
+            partition=self.queue,
+            msg=self.msg,
+            email=self.email,
+            walltime=self.walltime,
+            nodes=self.nodes,
+            ppn=self.ppn,
+            mem=self.mem,
+        )
+
     def set_shell_config(self) -> str:
         """Configuraton stuff for the shell"""
 
-        string = "#!/bin/sh\n"
-        string += "\n"
-        string += "# This script was created by the STEVMA module\n"
-        string += "# to manually run the grid of stellar evolution\n"
-        string += "# models, give executable permissions to the script\n"
-        string += "# and then submit the desired models found in the\n"
-        string += "# different *.folders files using the shell script\n"
-        string += f"# with name: {self.name}\n"
-        string += f"# e.g.: `$ {self.name} job_0.folders`\n"
-
-        return string
+        return self._shell_config
 
     def set_slurm_config(self) -> str:
         """Configuration options of the Slurm job"""
-        string = "#SBATCH -S /bin/bash\n"
-        string += f"#SBATCH --job-name={self.name}\n"
-        string += f"#SBATCH --out={self.out_fname}\n"
-        string += f"#SBATCH --partition {self.queue}\n"
-        string += f"#SBATCH --mail-type={self.msg}\n"
-        string += f"#SBATCH --mail-user={self.email}\n"
-        string += f"#SBATCH --time={self.walltime}\n"
-        string += f"#SBATCH --nodes={self.nodes} --cpus-per-task={self.ppn}\n"
-        string += f"#SBATCH --mem={self.mem}gb\n"
-        string += '\nexport SCRATCH="/scratch/$USER.$PBS_JOBID"\n'
-        return string
+        return self._slurm_config
 
     def write_job_to_file(self, fname: str = "") -> None:
         """Write job to a file
@@ -108,14 +132,12 @@ class SlurmJob:
             Filename for the Slurm job
         """
 
-        msg = self.set_shell_config()
-        msg += "\n\n"
-        msg += self.set_slurm_config()
-        msg += "\n"
-        msg += self.command
-
-        with open(fname, "w") as f:
-            f.write(msg)
+        # join once and write the whole script in a single call
+        Path(fname).write_text(
+            "".join((self.set_shell_config(), "\n\n", self.set_slurm_config(), "\n", self.command))
+        )
+        # make it executable now so submissions need no chmod at all
+        os.chmod(fname, os.stat(fname).st_mode | 0o111)
 
     def submit(self, fname: str = "", root_dir: str = "") -> None:
         """Submit Slurm job to queue
@@ -126,16 +148,18 @@ class SlurmJob:
            Filename of the PBS job.
         """
         try:
+            # the executable bit was set when the job file was written
             p = subprocess.Popen(
-                f"chmod +x {fname}; ./{fname}",
-                shell=True,
-                executable="/bin/sh",
+                [f"./{fname}"],
                 cwd=root_dir,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
             )
-            stdout, stderr = p.communicate()
-            if stderr is not None:
-                print(f"WARNING: could not run shell job: {str(stderr)}")
+            # stream output as it is produced rather than buffering it all in communicate()
+            for line in p.stdout:  # type: ignore[union-attr]
+                sys.stdout.buffer.write(line)
+            p.wait()
+            if p.returncode != 0:
+                print(f"WARNING: could not run shell job: exit code {p.returncode}")
         except Exception as e:
             print(e)
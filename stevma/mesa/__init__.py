@@ -1,15 +1,19 @@
 """Main module driver to manage MESA simulations
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
+import logging
+import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 
-from stevma.io import Database, logger
+from stevma.io import Database, logger, progress_bar
 from stevma.job import MESAJob, ShellJob, SlurmJob
 
-from .mesa import MESAmodel
+from .mesa import MESAmodel, MESAmodelEntry
 from .utils import get_mesa_defaults, mesa_namelists, split_grid
 
 __all__ = ["get_mesa_defaults", "MESAGrid", "mesa_namelists"]
@@ -20,25 +24,37 @@ class MESAGrid:
 
     Parameters
     ----------
-    meshgrid : `dict`
-        Dictionary with input values of the grid of MESA models
+    meshgrid : `list`
+        List with input values of the grid of MESA models, indexed by identifier
     """
 
-    def __init__(self, meshgrid: Dict[Any, Any] = dict(), config: Dict[Any, Any] = dict()) -> None:
-        self.meshgrid = meshgrid
-        self.config = config
-
-        # load MESA models into a dictionary
-        self.MESAmodels: Dict[Any, Any] = dict()
+    def __init__(
+        self,
+        meshgrid: Optional[List[Dict[str, Any]]] = None,
+        config: Optional[Dict[Any, Any]] = None,
+    ) -> None:
+        self.meshgrid = meshgrid if meshgrid is not None else []
+        self.config = config if config is not None else {}
+
+        # config sections used throughout the methods, fetched once instead of per call
+        self.modelsDict = self.config.get("Models") or {}
+        self.templateDict = self.config.get("Template") or {}
+        self.mesaDict = self.config.get("Mesa") or {}
+        self.managerDict = self.config.get("Manager") or {}
+        self.databaseDict = self.config.get("Database") or {}
+
+        # load MESA models into a list of MESAmodelEntry objects; like the meshgrid, the
+        # position of each entry is the identifier of its model
+        self.MESAmodels: List[MESAmodelEntry] = []
 
         # load database as an object
         self.database = Database(
-            database_name=self.config["Database"].get("filename"),
-            remove_database=self.config["Database"].get("remove_database"),
+            database_name=self.databaseDict.get("filename"),  # type: ignore
+            remove_database=self.databaseDict.get("remove_database"),  # type: ignore
         )
 
     def create_MESAmodels(self) -> None:
-        """Create a dictionary with each key being a different MESAmodel object"""
+        """Create a list in which each element holds a different MESAmodel object"""
 
         logger.info("creating MESAmodel objects for each element in the meshgrid")
 
@@ -47,38 +63,55 @@ class MESAGrid:
             sys.exit(1)
 
         # some useful dictionaries for creating MESAmodel objects
-        runsDict = self.config.get("Models")
-        templateDict = self.config.get("Template")
-        mesaDict = self.config.get("Mesa")
-
-        # loop over meshgrid to create MESAmodel objects
-        for key in self.meshgrid.keys():
-            logger.info(f"updating MESAmodels with id: {key}")
-
-            self.MESAmodels[key] = dict()
-            self.MESAmodels[key].update(
-                {
-                    "MESAmodel": MESAmodel(
-                        identifier=int(key),
-                        template_directory=templateDict.get("output_directory"),  # type: ignore
-                        run_root_directory=runsDict.get("output_directory"),  # type: ignore
-                        is_binary_evolution=templateDict.get("is_binary_evolution"),  # type: ignore
-                        model_id=runsDict.get("id"),  # type: ignore
-                        mesa_dir=mesaDict.get("mesa_dir"),  # type: ignore
-                        mesasdk_dir=mesaDict.get("mesasdk_root"),  # type: ignore
-                        mesa_caches_dir=mesaDict.get("mesa_caches_dir"),  # type: ignore
-                        mesabin2dco_dir=mesaDict.get("mesabin2dco_dir"),  # type: ignore
-                        **self.meshgrid[key],
-                    )
-                }
-            )
-
-            # load options for MESA simulations
-            self.MESAmodels[key]["MESAmodel"].load_options(templateDict.get("options_filename"))  # type: ignore
-
-            # get dictionaries for template & run namelists
-            self.MESAmodels[key]["MESAmodel"].set_template_namelists()
-            self.MESAmodels[key]["MESAmodel"].set_run_namelists()
+        runsDict = self.modelsDict
+        templateDict = self.templateDict
+        mesaDict = self.mesaDict
+
+        # options shared by every MESAmodel, computed once instead of once per grid point
+        common_kwargs = {
+            "template_directory": templateDict.get("output_directory"),
+            "run_root_directory": runsDict.get("output_directory"),
+            "is_binary_evolution": templateDict.get("is_binary_evolution"),
+            "model_id": runsDict.get("id"),
+            "mesa_dir": mesaDict.get("mesa_dir"),
+            "mesasdk_dir": mesaDict.get("mesasdk_root"),
+            "mesa_caches_dir": mesaDict.get("mesa_caches_dir"),
+            "mesabin2dco_dir": mesaDict.get("mesabin2dco_dir"),
+        }
+        options_filename = templateDict.get("options_filename")
+
+        # the YAML options and the template namelists are identical for every model (only the
+        # template of the first model is ever written to disk), so the first model acts as a
+        # prototype and the rest share its dictionaries read-only
+        prototype: Optional[MESAmodel] = None
+
+        # one summary log instead of one record per grid point; the bar below tracks progress
+        logger.info("building %d MESAmodel instances", len(self.meshgrid))
+
+        # loop over meshgrid to create MESAmodel objects; the list index is the identifier
+        total = len(self.meshgrid)
+        for identifier, gridpoint in enumerate(self.meshgrid):
+            progress_bar(identifier + 1, total, left_msg="creating MESAmodels")
+
+            model = MESAmodel(identifier=identifier, **common_kwargs, **gridpoint)  # type: ignore
+
+            if prototype is None:
+                # load options for MESA simulations & compute the template namelists once
+                model.load_options(options_filename)  # type: ignore
+                model.set_template_namelists()
+                prototype = model
+            else:
+                model._MESAOptions = prototype._MESAOptions
+                model.namelists_for_init = prototype.namelists_for_init
+                model.namelists_for_template = prototype.namelists_for_template
+
+            # the run namelists do change between models
+            model.set_run_namelists()
+
+            self.MESAmodels.append(MESAmodelEntry(mesa_model=model))
+
+        # leave the progress bar line
+        sys.stdout.write("\n")
 
     def set_MESAmodels_structure(self) -> None:
         """Method that takes care of creating the template & run directories for the meshgrid of
@@ -88,44 +121,30 @@ class MESAGrid:
         logger.info("setting template and run structure for MESA runs")
 
         # some useful dictionaries for creating MESArun objects
-        runsDict = self.config.get("Models")
-        templateDict = self.config.get("Template")
-        mesaDict = self.config.get("Mesa")
-
-        # extras
-        extra_template_files = []
-        extra_src_folders = []
-        extra_src_files = []
-        extra_makefile = []
-
-        # check for extra files and folders
-        extras = templateDict.get("extras")  # type: ignore
-
-        if not extras["extra_dir_in_src"] is None:
-            if len(extras["extra_dir_in_src"]) > 0:
-                extra_src_folders = extras["extra_dir_in_src"]
-
-        if not extras["extra_files_in_src"] is None:
-            if len(extras["extra_files_in_src"]) > 0:
-                extra_src_files = extras["extra_files_in_src"]
-
-        if not extras["extra_template_files"] is None:
-            if len(extras["extra_template_files"]) > 0:
-                extra_template_files = extras["extra_template_files"]
-
-        if not extras["extra_makefile"] is None:
-            if len(extras["extra_makefile"]) > 0:
-                extra_makefile = extras["extra_makefile"]
+        runsDict = self.modelsDict
+        templateDict = self.templateDict
+        mesaDict = self.mesaDict
+
+        # check for extra files and folders. a missing, None or empty config entry means no
+        # extras; list() guarantees an appendable copy (see the mesabin2dco case below)
+        extras = templateDict.get("extras")
+        extra_src_folders, extra_src_files, extra_template_files, extra_makefile = (
+            list(extras.get(name) or [])  # type: ignore
+            for name in (
+                "extra_dir_in_src",
+                "extra_files_in_src",
+                "extra_template_files",
+                "extra_makefile",
+            )
+        )
 
         # if the id of the runs is `mesabin2dco`, add inlists from src code
-        if runsDict.get("id") == "mesabin2dco":  # type: ignore
-            extra_template_files.append(f"{mesaDict.get('mesabin2dco_dir')}/inlist_ce")  # type: ignore
-            extra_template_files.append(f"{mesaDict.get('mesabin2dco_dir')}/inlist_cc")  # type: ignore
-
-        # create template stucture of MESAruns just once
-        keys = list(self.meshgrid.keys())
-        key0 = keys[0]
-        self.MESAmodels[key0]["MESAmodel"].create_template_structure(
+        if runsDict.get("id") == "mesabin2dco":
+            extra_template_files.append(f"{mesaDict.get('mesabin2dco_dir')}/inlist_ce")
+            extra_template_files.append(f"{mesaDict.get('mesabin2dco_dir')}/inlist_cc")
+
+        # create template stucture of MESAruns just once, using the first model
+        self.MESAmodels[0].mesa_model.create_template_structure(
             copy_default_workdir=True,
             replace=templateDict.get("overwrite"),  # type: ignore
             extra_src_folders=extra_src_folders,
@@ -133,38 +152,47 @@ class MESAGrid:
             extra_makefile=extra_makefile,
             extra_template_files=extra_template_files,
         )
-        self.MESAmodels[key0]["MESAmodel"].save_namelists_to_file(name_id="template")
+        self.MESAmodels[0].mesa_model.save_namelists_to_file(name_id="template")
 
         # also, save *.list files with the information on the columns that will be saved by MESA
-        list_filenames = []
-        for name in [
-            mesaDict.get("history_columns_filename"),  # type: ignore
-            mesaDict.get("profile_columns_filename"),  # type: ignore
-            mesaDict.get("binary_history_columns_filename"),  # type: ignore
-        ]:
-            if name is not None and name != "":
-                list_filenames.append(name)
-        self.MESAmodels[key0]["MESAmodel"].copy_column_list_files(filenames=list_filenames)
-
-        # create and store namelists into each run folder
-        for key in keys:
-            self.MESAmodels[key]["MESAmodel"].create_run_structure()
-            self.MESAmodels[key]["MESAmodel"].save_namelists_to_file(name_id="run")
+        list_filenames = [
+            name
+            for name in (
+                mesaDict.get(key)
+                for key in (
+                    "history_columns_filename",
+                    "profile_columns_filename",
+                    "binary_history_columns_filename",
+                )
+            )
+            if name
+        ]
+        self.MESAmodels[0].mesa_model.copy_column_list_files(filenames=list_filenames)
+
+        # create and store namelists into each run folder. each run is independent and the work
+        # is filesystem-bound (mkdir + small writes), so threads overlap the syscall latency
+        def setup_run(entry: MESAmodelEntry) -> None:
+            model = entry.mesa_model
+            model.create_run_structure()
+            model.save_namelists_to_file(name_id="run")
+
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+            list(executor.map(setup_run, self.MESAmodels))
 
     def compile_template(self) -> None:
         """Compile template with MESA source code"""
-        # compile it
-        self.MESAmodels["0"]["MESAmodel"].compile_template()
+        # compile it. any model can do it since the template is shared
+        self.MESAmodels[0].mesa_model.compile_template()
 
     def split_MESAmodels(self) -> None:
-        """Split the meshgrid of MESAmodels into smaller ones by adding a new key to the dictionary
-        with the name `job_id`
+        """Split the meshgrid of MESAmodels into smaller ones by setting the `job_id` of each
+        entry
         """
 
-        logger.info("splitting MESAmodels dictionary into smaller meshgrids")
+        logger.info("splitting MESAmodels list into smaller meshgrids")
 
         # dictionary with manager settings
-        managerDict = self.config.get("Manager")
+        managerDict = self.managerDict
 
         # split grid
         self.MESAmodels = split_grid(
@@ -177,36 +205,48 @@ class MESAGrid:
         logger.info("dumping MESAmodels into database")
 
         # utils
-        table_name = self.config["Database"].get("tablename")
-        drop_table = self.config["Database"].get("drop_table")
-
-        # drop table if exists
-        if drop_table:
-            self.database.drop_table(table_name=table_name)
-
-        # first time in the loop will create database. the rest will only insert things
-        create_db = True
-        for key in self.MESAmodels.keys():
-            # dict to insert into db, pay attention to the "status" hardcoded to be "not computed"
+        table_name = self.databaseDict.get("tablename")
+        drop_table = self.databaseDict.get("drop_table")
+
+        # collect every record first; pay attention to the "status" hardcoded to "not computed"
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        table_rows = []
+        for key, entry in enumerate(self.MESAmodels):
+            model = entry.mesa_model
             table_dict = {
-                "id": int(key),
-                "model_name": str(self.MESAmodels[key]["MESAmodel"].run_name),
-                "template_directory": str(self.MESAmodels[key]["MESAmodel"].template_directory),
-                "runs_directory": str(self.MESAmodels[key]["MESAmodel"].run_root_directory),
-                "job_id": int(self.MESAmodels[key]["job_id"]),
+                "id": key,
+                "model_name": str(model.run_name),
+                "template_directory": str(model.template_directory),
+                "runs_directory": str(model.run_root_directory),
+                "job_id": int(entry.job_id),
                 "status": "not computed",
             }
+            if debug_enabled:
+                logger.debug("database element (%s): %s", key, table_dict)
+            table_rows.append(table_dict)
+
+        if len(table_rows) == 0:
+            logger.error("no MESAmodels to dump into database")
+            return
+
+        # drop & create the table and insert every record within a single transaction, so the
+        # whole dump costs one commit (one fsync) no matter the size of the meshgrid
+        with self.database.transaction():
+            if drop_table:
+                self.database.drop_table(table_name=table_name, commit=False)  # type: ignore
+            logger.debug("creating table: %s in database", table_name)
+            self.database.create_table(
+                table_name=table_name, table_data_dict=table_rows[0], commit=False  # type: ignore
+            )
+            self.database.insert_records(
+                table_name=table_name, table_data_rows=table_rows  # type: ignore
+            )
 
-            # create database if needed
-            if create_db:
-                logger.debug(f"creating table: {table_name} in database")
-                self.database.create_table(table_name=table_name, table_data_dict=table_dict)
-                # creation completed !
-                create_db = False
-
-            # insert row into db
-            logger.debug(f"inserting database element ({key}): {table_dict}")
-            self.database.insert_record(table_name=table_name, table_data_dict=table_dict)
+        # lookup indexes are built only after the bulk insert, so the ingest itself does not
+        # pay for per-row index maintenance
+        self.database.create_indexes(
+            table_name=table_name, column_names=("id", "model_name")  # type: ignore
+        )
 
     def create_template_job(self) -> None:
         """Create the shell script to be used to run the stellar evolution simulations"""
@@ -216,10 +256,10 @@ class MESAGrid:
         )
 
         # some useful dictionaries for creating template job script
-        mesaDict = self.config.get("Mesa")
-        templateDict = self.config.get("Template")
-        runsDict = self.config.get("Models")
-        managerDict = self.config.get("Manager")
+        mesaDict = self.mesaDict
+        templateDict = self.templateDict
+        runsDict = self.modelsDict
+        managerDict = self.managerDict
 
         # mesaJob object contains all the stuff needed to make a MESA run
         mesaJob = MESAJob(
@@ -239,10 +279,10 @@ class MESAGrid:
 
         # create manager job and write it to a file
         fname = ""
-        if managerDict.get("job_file_prefix") != "":  # type: ignore
-            fname += f"{managerDict.get('job_file_prefix')}"  # type: ignore
-        if managerDict.get("job_filename") != "":  # type: ignore
-            fname += f"{managerDict.get('job_filename')}"  # type: ignore
+        if managerDict.get("job_file_prefix") != "":
+            fname += f"{managerDict.get('job_file_prefix')}"
+        if managerDict.get("job_filename") != "":
+            fname += f"{managerDict.get('job_filename')}"
 
         # if fname is empty, exit with an error
         if fname == "":
@@ -253,12 +293,12 @@ class MESAGrid:
             sys.exit(1)
 
         # create the script depending on the type of manager to use for the simulations
-        if managerDict.get("manager") == "shell":  # type: ignore
+        if managerDict.get("manager") == "shell":
 
             job = ShellJob(name=fname, command=command)
             job.write_job_to_file(fname=fname)
 
-        elif managerDict.get("manager") == "slurm":  # type: ignore
+        elif managerDict.get("manager") == "slurm":
 
             job = SlurmJob(  # type: ignore
                 name=managerDict.get("hpc")["name"],  # type: ignore
@@ -293,30 +333,29 @@ class MESAGrid:
         )
 
         # useful dicts
-        managerDict = self.config.get("Manager")
-        runsDict = self.config.get("Models")
+        managerDict = self.managerDict
+        runsDict = self.modelsDict
 
-        number_of_jobs = managerDict.get("number_of_jobs")  # type: ignore
-        for k in range(number_of_jobs):
-            fname = f"{runsDict.get('output_directory')}/job_{k}.folders"  # type: ignore
-            logger.debug(f"going to write folders for job_id {k} in file {fname}")
+        number_of_jobs = managerDict.get("number_of_jobs")
 
-            directory_list = []
-            for id_number in self.MESAmodels:
-                # each element in the dict has a MESAmodel object and a job_id
-                mesaModel = self.MESAmodels[id_number]["MESAmodel"]
-                jobId = self.MESAmodels[id_number]["job_id"]
+        output_directory = runsDict.get("output_directory")
 
-                # just append with the proper job_id value
-                if jobId == k:
-                    directory_list.append(mesaModel.run_name)
+        # bucket run names by job_id in a single pass over the meshgrid
+        buckets: List[List[str]] = [[] for _ in range(number_of_jobs)]  # type: ignore
+        for entry in self.MESAmodels:
+            # each element in the list has a MESAmodel object and a job_id
+            buckets[entry.job_id].append(entry.mesa_model.run_name)
 
-            logger.debug(f"folder list for job_id {k}: {directory_list}")
-            logger.debug(f"number of folders: {len(directory_list)}")
+        # then write each file with a single joined string
+        for k, directory_list in enumerate(buckets):
+            fname = f"{output_directory}/job_{k}.folders"
+            # stringifying the full folder list is O(N); only do it at DEBUG level
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("going to write folders for job_id %d in file %s", k, fname)
+                logger.debug("folder list for job_id %d: %s", k, directory_list)
+                logger.debug("number of folders: %d", len(directory_list))
 
-            with open(fname, "w") as f:
-                for directory in directory_list:
-                    f.write(f"{directory}\n")
+            Path(fname).write_text("\n".join(directory_list) + ("\n" if directory_list else ""))
 
     def submit_specific_job(self, job_id: int = 0) -> None:
         """Submit a job to a queue"""
@@ -327,31 +366,38 @@ class MESAGrid:
             sys.exit(1)
 
         # useful dicts
-        managerDict = self.config.get("Manager")
-        runsDict = self.config.get("Models")
+        managerDict = self.managerDict
+        runsDict = self.modelsDict
 
         # get number of jobs
-        number_of_jobs = managerDict.get("number_of_jobs")  # type: ignore
+        number_of_jobs = managerDict.get("number_of_jobs")
 
         # check that the job_id is lower than the number of jobs
-        if job_id > number_of_jobs:
+        if job_id > number_of_jobs:  # type: ignore
             logger.critical("job_id cannot be higher than the number of jobs (number_of_jobs)")
             sys.exit(1)
 
         # name of the file with the runs of the specific job_id
-        fname = f"{runsDict.get('output_directory')}/job_{job_id}.folders"  # type: ignore
+        fname = f"{runsDict.get('output_directory')}/job_{job_id}.folders"
 
         # submit depending on the manager
-        if managerDict.get("manager") == "shell":  # type: ignore
+        if managerDict.get("manager") == "shell":
             try:
+                # use an argument list (no shell needed) and stream the output line by line,
+                # so memory stays constant no matter how much the job prints
                 p = subprocess.Popen(
-                    f"sh {fname}",
-                    stdin=subprocess.PIPE,
+                    ["sh", str(fname)],
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT,
+                    bufsize=1,
+                    text=True,
                 )
-                stdout, stderr = p.communicate()
-                print(stdout[:-1])
+                for line in p.stdout:  # type: ignore
+                    logger.info(line.rstrip())
+
+                returncode = p.wait()
+                if returncode != 0:
+                    logger.critical("job `%s` exited with code %d", fname, returncode)
 
             except Exception as e:
                 print(e)
@@ -361,3 +407,50 @@ class MESAGrid:
                 "using a different manager than `shell` is not ready to be used to submit a job"
             )
             sys.exit(1)
+
+    def submit_all_jobs(self) -> None:
+        """Submit every job of the meshgrid concurrently and wait for all of them to finish
+
+        Jobs are independent of each other, so instead of launching them one at a time the
+        whole set is started at once and the wall-clock time becomes that of the slowest job
+        """
+
+        # useful dicts
+        managerDict = self.managerDict
+        runsDict = self.modelsDict
+
+        number_of_jobs = int(managerDict.get("number_of_jobs"))  # type: ignore
+
+        if managerDict.get("manager") != "shell":
+            logger.critical(
+                "using a different manager than `shell` is not ready to be used to submit a job"
+            )
+            sys.exit(1)
+
+        output_directory = runsDict.get("output_directory")
+
+        def run_one(job_id: int) -> int:
+            fname = f"{output_directory}/job_{job_id}.folders"
+            p = subprocess.Popen(
+                ["sh", str(fname)],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=1,
+                text=True,
+            )
+            # stream each job's output into the log as it arrives
+            for line in p.stdout:  # type: ignore
+                logger.info("job %d: %s", job_id, line.rstrip())
+            return p.wait()
+
+        with ThreadPoolExecutor(max_workers=number_of_jobs) as executor:
+            futures = {executor.submit(run_one, k): k for k in range(number_of_jobs)}
+            for future in as_completed(futures):
+                job_id = futures[future]
+                try:
+                    returncode = future.result()
+                except Exception as e:
+                    logger.critical(f"job {job_id} raised: {e}")
+                else:
+                    if returncode != 0:
+                        logger.critical(f"job {job_id} exited with code {returncode}")
@@ -1,15 +1,170 @@
 """Module with single MESA model
 """
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+import os
+import re
 import subprocess
 import sys
+import threading
+from functools import lru_cache
 from pathlib import Path
 from shutil import copyfile, copytree, rmtree
 
 from stevma.io import dump_dict_to_namelist_string, load_yaml, logger
 
-from .utils import get_mesa_defaults, mesa_main_namelists, mesa_namelists
+from .utils import get_mesa_defaults, get_mesa_option_index, mesa_main_namelists, mesa_namelists
+
+# options that always get copied verbatim when diffing against MESA defaults (see
+# `MESAmodel.__get_non_default_values_for_namelists__`)
+_READ_EXTRA_BINARY_KEYS = frozenset(f"read_extra_binary_controls_inlist{k}" for k in range(1, 6))
+_EXTRA_BINARY_NAME_KEYS = frozenset(f"extra_binary_controls_inlist{k}_name" for k in range(1, 6))
+
+# strings that `float` accepts (plain or scientific notation). checking with a regex is much
+# cheaper than letting `float` raise on every non-numeric option value
+_FLOAT_RE = re.compile(r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$")
+
+# namelist groups as frozensets, so membership checks inside the emission loops are O(1)
+_STAR_NAMELISTS = frozenset(mesa_namelists.star_namelists)
+_BINARY_NAMELISTS = frozenset(mesa_namelists.binary_namelists)
+
+# every valid MESA namelist (star + binary), computed once instead of per call
+_ALL_NAMELISTS = _STAR_NAMELISTS | _BINARY_NAMELISTS
+
+
+def _replace_directory_tokens(value: str, run_dir: str, template_dir: str) -> str:
+    """Substitute the `#{run}` / `#{template}` placeholders with their directories
+
+    Only the last path component of the original value is kept, since templates reference
+    files by name
+
+    Parameters
+    ----------
+    value : `str`
+        Option value possibly holding a placeholder
+
+    run_dir : `str`
+        Folder of the run, replaces `#{run}`
+
+    template_dir : `str`
+        Folder of the template, replaces `#{template}`
+    """
+
+    if "#{run}" in value:
+        return f"{run_dir}/{value.rsplit('/', 1)[-1]}"
+    elif "#{template}" in value:
+        return f"{template_dir}/{value.rsplit('/', 1)[-1]}"
+    return value
+
+
+def _replace_directory_tokens_in_dict(
+    d: Dict[Any, Any], run_dir: str, template_dir: str
+) -> Dict[Any, Any]:
+    """Apply `_replace_directory_tokens` to every string value of `d` (in place)"""
+
+    for key, value in d.items():
+        if isinstance(value, str):
+            d[key] = _replace_directory_tokens(value, run_dir, template_dir)
+
+    return d
+
+
+def _freeze(value: Any) -> Any:
+    """Turn nested dicts/lists into hashable tuples, for use as cache keys"""
+
+    if isinstance(value, dict):
+        return tuple((key, _freeze(val)) for key, val in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(val) for val in value)
+    return value
+
+
+# serialized namelist blocks keyed on their content (see `_dump_namelist_cached`)
+_DUMP_CACHE: Dict[Any, str] = {}
+
+
+def _dump_namelist_cached(data: Dict[Any, Any], namelist: str) -> str:
+    """Serialize a namelist block, reusing the output of identical earlier content
+
+    Across the runs of a grid most namelists (pgstar, binary_job, ...) are byte-identical,
+    only the varied options differ; caching by content avoids re-serializing the invariant
+    blocks once per grid point
+
+    Parameters
+    ----------
+    data : `dict`
+        Options of the namelist
+
+    namelist : `str`
+        Name of the namelist
+    """
+
+    try:
+        key = (namelist, _freeze(data))
+        block = _DUMP_CACHE.get(key)
+    except TypeError:
+        # unhashable value somewhere in the options: serialize without caching
+        return dump_dict_to_namelist_string(data=data, namelist=namelist, array_inline=False)
+
+    if block is None:
+        block = dump_dict_to_namelist_string(data=data, namelist=namelist, array_inline=False)
+        if len(_DUMP_CACHE) < 2048:
+            _DUMP_CACHE[key] = block
+
+    return block
+
+
+@lru_cache(maxsize=None)
+def _star_inlist_patch(
+    template_dir: str, namelists: Tuple[str, ...], project_inlist_name: str
+) -> Dict[str, Dict[str, Any]]:
+    """Per-namelist `read_extra_*` additions pointing the star inlists at the template
+
+    Every model of a grid shares the same template, so this patch is identical across grid
+    points; memoizing it avoids rebuilding the same dicts and f-strings once per run. The
+    returned dicts are shared and must not be mutated
+
+    Parameters
+    ----------
+    template_dir : `str`
+        Folder of the template holding the project inlist
+
+    namelists : `tuple`
+        Star namelists that are present and non-empty in the template
+
+    project_inlist_name : `str`
+        Name of the project inlist file inside the template
+    """
+
+    return {
+        namelist: {
+            f"read_extra_{namelist}_inlist1": True,
+            f"extra_{namelist}_inlist1_name": f"{template_dir}/{project_inlist_name}",
+        }
+        for namelist in namelists
+    }
+
+
+class MESAmodelEntry:
+    """Lightweight container pairing a MESAmodel with the job it belongs to
+
+    Using `__slots__` avoids a per-entry dict (and its string-key hashing) for every point in the
+    meshgrid, which matters when grids reach thousands of models
+
+    Parameters
+    ----------
+    mesa_model : `MESAmodel`
+        Model of a single point in the meshgrid
+
+    job_id : `int`
+        Identifier of the job in charge of computing the model. It is set by `split_grid`
+    """
+
+    __slots__ = ("mesa_model", "job_id")
+
+    def __init__(self, mesa_model: "MESAmodel", job_id: int = -1) -> None:
+        self.mesa_model = mesa_model
+        self.job_id = job_id
 
 
 class MESAmodel:
@@ -115,26 +270,20 @@ class MESAmodel:
         mesasdk_dir: Union[str, Path] = "",
         mesa_caches_dir: Union[str, Path] = "",
         mesabin2dco_dir: Union[str, Path] = "",
-        variables: Dict[Any, Any] = {},
-        namelists_for_init: Dict[Any, Any] = {},
-        namelists_for_template: Dict[Any, Any] = {},
-        namelists_for_run: Dict[Any, Any] = {},
+        variables: Optional[Dict[Any, Any]] = None,
+        namelists_for_init: Optional[Dict[Any, Any]] = None,
+        namelists_for_template: Optional[Dict[Any, Any]] = None,
+        namelists_for_run: Optional[Dict[Any, Any]] = None,
         **kwargs,
     ) -> None:
 
         # id to use in the database
         self.identifier = identifier
 
-        # let folders be handled by pathlib module
-        if isinstance(template_directory, str):
-            self.template_directory = Path(template_directory)
-        else:
-            self.template_directory = template_directory
-
-        if isinstance(run_root_directory, str):
-            self.run_root_directory = Path(run_root_directory)
-        else:
-            self.run_root_directory = run_root_directory
+        # let folders be handled by pathlib module. Path() is idempotent, so str and Path
+        # arguments are handled alike without branching
+        self.template_directory = Path(template_directory)
+        self.run_root_directory = Path(run_root_directory)
 
         # flag to control the type of model between star or binary
         self.is_binary_evolution = is_binary_evolution
@@ -143,75 +292,84 @@ class MESAmodel:
         self.model_id = model_id
 
         # mesa specific folders
-        if isinstance(mesa_dir, str):
-            self.mesa_dir = Path(mesa_dir)
-        else:
-            self.mesa_dir = mesa_dir
-        if isinstance(mesasdk_dir, str):
-            self.mesasdk_dir = Path(mesasdk_dir)
-        else:
-            self.mesasdk_dir = mesasdk_dir
-        if isinstance(mesa_caches_dir, str):
-            self.mesa_caches_dir = Path(mesa_caches_dir)
-        else:
-            self.mesa_caches_dir = mesa_caches_dir
+        self.mesa_dir = Path(mesa_dir)
+        self.mesasdk_dir = Path(mesasdk_dir)
+        self.mesa_caches_dir = Path(mesa_caches_dir)
 
         # load MESA defaults
         self._MESADefaults = get_mesa_defaults(mesa_dir=self.mesa_dir)
 
-        # try to load mesabin2dco defaults if path is given, else leave it as empty
-        if isinstance(mesabin2dco_dir, str):
-            self.mesabin2dco_dir = Path(mesabin2dco_dir)
-        else:
-            self.mesabin2dco_dir = mesabin2dco_dir
-        try:
-            self._MESAbin2dcoDefaults = get_mesa_defaults(mesa_dir=self.mesabin2dco_dir)
-        except Exception as e:
-            logger.error(e)
-            self._MESAbin2dcoDefaults = dict()
+        # mesabin2dco defaults are loaded lazily (see `_MESAbin2dcoDefaults`): pure mesastar /
+        # mesabinary models never consult them, so they should not pay for the parse
+        self.mesabin2dco_dir = Path(mesabin2dco_dir)
+        self.__mesabin2dco_defaults: Optional[Dict[Any, Any]] = None
 
         # hidden name of run
         self.__run_name_from_kwargs__ = ""
 
         # get name and value of parameter that will be changing in the grid
         # in case this is in a database, it can be set at runtime
-        if len(variables) == 0:
+        if not variables:
+            # the cached option -> namelist index classifies each kwarg with a single lookup
+            option_index = get_mesa_option_index(mesa_dir=self.mesa_dir)
+
             variables = dict()
+
+            # name parts are only collected when no custom name was given; with a custom name
+            # the joined string would be computed and thrown away
+            collect_name_parts = custom_run_name == ""
+            run_name_parts = []
             for key, value in kwargs.items():
-                found_variable_name = False
-                for namelist in self._MESADefaults.keys():
-                    if key in self._MESADefaults.get(namelist):  # type: ignore
-                        found_variable_name = True
-                        break
+                # defaults keys are interned, so interned kwargs hit them by identity
+                key = sys.intern(key)
+                namelist = option_index.get(key)
 
-                if found_variable_name:
+                if namelist is not None:
                     # check whether the namelist is already present in the
                     # variable dictionary, else add it
                     if namelist not in variables:
                         variables[namelist] = dict()
                     # then, add key and value to variable dictionary
                     variables[namelist][key] = value
-                    self.__run_name_from_kwargs__ += f"{key}_{value}_"
+                    if collect_name_parts:
+                        run_name_parts.append(f"{key}_{value}")
                 else:
                     logger.error(f"could not find `{key}` in MESA parameter list")
+
+            if collect_name_parts:
+                self.__run_name_from_kwargs__ = "_".join(run_name_parts)
         self.variables = variables
 
         # use a name for the run, sort of string id
         if custom_run_name != "":
             self.run_name = custom_run_name
         else:
-            self.run_name = self.__run_name_from_kwargs__[:-1]
+            self.run_name = self.__run_name_from_kwargs__
 
         # run folder is a combination of the root of run plus a custom name
         self.run_directory = self.run_root_directory / self.run_name
 
+        # cached string forms used by the namelist placeholder substitutions
+        self._run_dir_str = str(self.run_directory)
+        self._template_dir_str = str(self.template_directory)
+
         # again, if not the first time using this, a database can have this information
-        if len(namelists_for_init) == 0:
-            self.namelists_for_init: Dict[Any, Any] = dict()
-        if len(namelists_for_template) == 0:
-            self.namelists_for_template: Dict[Any, Any] = dict()
-        if len(namelists_for_run) == 0:
-            self.namelists_for_run: Dict[Any, Any] = dict()
+        self.namelists_for_init: Dict[Any, Any] = namelists_for_init or dict()
+        self.namelists_for_template: Dict[Any, Any] = namelists_for_template or dict()
+        self.namelists_for_run: Dict[Any, Any] = namelists_for_run or dict()
+
+    @property
+    def _MESAbin2dcoDefaults(self) -> Dict[Any, Any]:
+        """MESAbin2dco defaults, parsed on first use and cached on the instance"""
+
+        if self.__mesabin2dco_defaults is None:
+            try:
+                self.__mesabin2dco_defaults = get_mesa_defaults(mesa_dir=self.mesabin2dco_dir)
+            except Exception as e:
+                logger.error(e)
+                self.__mesabin2dco_defaults = dict()
+
+        return self.__mesabin2dco_defaults
 
     def load_options(self, fname: Union[str, Path] = "") -> None:
         """Load options needed for a MESA model
@@ -236,7 +394,7 @@ class MESAmodel:
         self._MESAOptions = load_yaml(fname=fname)
 
     def __get_non_default_values_for_namelists__(
-        self, Options: Dict[Any, Any] = {}, namelists: Tuple[Any, ...] = ()
+        self, Options: Optional[Dict[Any, Any]] = None, namelists: Tuple[Any, ...] = ()
     ) -> Dict[Any, Any]:
         """Look for non default options in namelists when compared to MESA defaults
 
@@ -252,90 +410,70 @@ class MESAmodel:
         -------
         """
 
-        if len(Options) == 0:
-            raise ValueError(f"`Options` (dict argument) cannot be an empty dictionary")
-
-        # depending on the namelist of MESA, use defaults of MESAbin2dco or MESA
-        if "bin2dco_controls" in namelists:
-            defaultDicts = self._MESAbin2dcoDefaults
-        else:
-            defaultDicts = self._MESADefaults
+        if not Options:
+            raise ValueError("`Options` (dict argument) cannot be an empty dictionary")
 
         nonDefaultOptions: Dict[Any, Any] = dict()
         for namelist in namelists:
             nonDefaultOptions[namelist] = dict()
 
+            # running count of occurrences of each array-valued fortran option (e.g.
+            # `xa_central(…)`), so its element index is a single increment instead of a
+            # rescan of everything collected so far
+            arr_counts: Dict[str, int] = dict()
+
+            # depending on the namelist of MESA, use defaults of MESAbin2dco or MESA. choosing
+            # per namelist lets callers diff star, binary & bin2dco groups in a single call
+            if namelist in mesa_namelists.bin2dco_namelists:
+                defaultDicts = self._MESAbin2dcoDefaults
+            else:
+                defaultDicts = self._MESADefaults
+
             optionsForNamelist = Options.get(namelist, None)
             if optionsForNamelist is not None:
+                # fetch the defaults of this namelist once instead of per option
+                defaultsForNamelist = defaultDicts.get(namelist)
+
                 for key, value in optionsForNamelist.items():
                     # some patches for some controls that are problematic
-                    if (
-                        key == "read_extra_binary_controls_inlist1"
-                        or key == "read_extra_binary_controls_inlist2"
-                        or key == "read_extra_binary_controls_inlist3"
-                        or key == "read_extra_binary_controls_inlist4"
-                        or key == "read_extra_binary_controls_inlist5"
-                    ):
+                    if key in _READ_EXTRA_BINARY_KEYS:
                         nonDefaultOptions[namelist][key] = value
                         continue
-                    elif (
-                        key == "extra_binary_controls_inlist1_name"
-                        or key == "extra_binary_controls_inlist2_name"
-                        or key == "extra_binary_controls_inlist3_name"
-                        or key == "extra_binary_controls_inlist4_name"
-                        or key == "extra_binary_controls_inlist5_name"
-                    ):
-                        if "#{run}" in value:
-                            arr = value.split("/")
-                            value = f"{self.run_directory}/{arr[-1]}"
-                        elif "#{template}" in value:
-                            arr = value.split("/")
-                            value = f"{self.template_directory}/{arr[-1]}"
+                    elif key in _EXTRA_BINARY_NAME_KEYS:
+                        value = _replace_directory_tokens(
+                            value, self._run_dir_str, self._template_dir_str
+                        )
                         nonDefaultOptions[namelist][key] = value
                         continue
 
                     # only add those options that do not match defaults
-                    if value != defaultDicts.get(namelist)[key]:  # type: ignore
+                    if value != defaultsForNamelist[key]:  # type: ignore
                         # this is to replace some template & run strings
                         if isinstance(value, str):
-                            if "#{run}" in value:
-                                arr = value.split("/")
-                                value = f"{self.run_directory}/{arr[-1]}"
-                            elif "#{template}" in value:
-                                arr = value.split("/")
-                                value = f"{self.template_directory}/{arr[-1]}"
+                            value = _replace_directory_tokens(
+                                value, self._run_dir_str, self._template_dir_str
+                            )
 
                         # another problem to solve is connected to floats that are
                         # written in scientific format
-                        if isinstance(value, str):
-                            try:
-                                value = float(value)
-                            except Exception:
-                                pass
+                        if isinstance(value, str) and _FLOAT_RE.match(value):
+                            value = float(value)
 
-                        # special treatment for arrays and how they are used in fortran
+                        # special treatment for arrays and how they are used in fortran:
+                        # in case there are more than one element in the dictionary as
+                        # a non default value, increase the array element index
                         if "(" in key and ")" in key:
                             key_id_arr = key.split("(")[0]
-
-                            # in case there are more than one element in the dictionary as
-                            # a non default value, increase the array element index
-                            if key_id_arr not in nonDefaultOptions.keys():
-                                repetition_number = 1
-                            else:
-                                repetition_number = 0
-                                for key in nonDefaultOptions.keys():
-                                    if key_id_arr in key:
-                                        repetition_number += 1
-                                repetition_number += 1
+                            arr_counts[key_id_arr] = arr_counts.get(key_id_arr, 0) + 1
 
                             # modify the key name
-                            key = f"{key_id_arr}({repetition_number})"
+                            key = f"{key_id_arr}({arr_counts[key_id_arr]})"
 
                         nonDefaultOptions[namelist][key] = value
 
         return nonDefaultOptions
 
-    def __pop_empty_namelists__(self, d: Dict[Any, Any] = {}) -> Dict[Any, Any]:
+    def __pop_empty_namelists__(self, d: Optional[Dict[Any, Any]] = None) -> Dict[Any, Any]:
         """Remove empty namelists from dict
 
         Parameters
@@ -344,20 +482,14 @@ class MESAmodel:
             Dictionary to search for empty elements to pop
         """
 
-        namelists = [namelist for namelist in mesa_namelists.star_namelists]
-        namelists.extend([namelist for namelist in mesa_namelists.binary_namelists])
-
-        keys_to_pop = []
-        for namelist in namelists:
-            if namelist in d:
-                if len(d[namelist]) == 0:
-                    keys_to_pop.append(namelist)
-
-        if len(keys_to_pop) > 0:
-            for key in keys_to_pop:
-                d.pop(key)
+        if d is None:
+            return dict()
 
-        return d
+        return {
+            key: value
+            for key, value in d.items()
+            if not (key in _ALL_NAMELISTS and len(value) == 0)
+        }
 
     def set_template_namelists(self) -> None:
         """Create namelists with options that do not change for different MESA models
@@ -365,19 +497,6 @@ class MESAmodel:
         These options are then considered to be a template for the model
         """
 
-        def replace_template_string_in_dict(d: Dict[Any, Any] = {}) -> Dict[Any, Any]:
-            """Replace a string with `template` in a key"""
-            for key, value in d.items():
-                try:
-                    if "#{template}" in d[key]:
-                        arr = value.split("/")
-                        value = f"{self.template_directory}/{arr[-1]}"
-                        d[key] = value
-                except TypeError:
-                    continue
-
-            return d
-
         logger.debug("setting template namelists")
 
         # first, structure the template for the most important namelist which lives
@@ -389,7 +508,9 @@ class MESAmodel:
                 # need to replace some strings here
                 for namelist in mesa_namelists.binary_namelists:
                     dictNamelist = mesa_main_namelists.namelists_for_mesabinary[namelist]
-                    inlistNamelists[namelist] = replace_template_string_in_dict(dictNamelist)
+                    inlistNamelists[namelist] = _replace_directory_tokens_in_dict(
+                        dictNamelist, self._run_dir_str, self._template_dir_str
+                    )
 
             elif self.model_id == "mesabin2dco":
                 dictNamelist = mesa_main_namelists.namelists_for_mesabin2dco["bin2dco_controls"]
@@ -412,7 +533,9 @@ class MESAmodel:
                 # again, some replacements are needed
                 for namelist in mesa_namelists.star_namelists:
                     dictNamelist = mesa_main_namelists.namelists_for_mesastar[namelist]
-                    inlistNamelists[namelist] = replace_template_string_in_dict(dictNamelist)
+                    inlistNamelists[namelist] = _replace_directory_tokens_in_dict(
+                        dictNamelist, self._run_dir_str, self._template_dir_str
+                    )
 
             else:
                 logger.critical(f"{self.model_id}: unknown id for creating template star namelists")
@@ -425,24 +548,26 @@ class MESAmodel:
         projectNamelists: Dict[Any, Any] = dict()
         if self.is_binary_evolution:
 
-            if self.model_id == "mesabinary" or self.model_id == "mesabin2dco":
-                mesabinaryOptions = self.__get_non_default_values_for_namelists__(
-                    Options=self._MESAOptions, namelists=mesa_namelists.binary_namelists
+            if self.model_id in {"mesabinary", "mesabin2dco"}:
+                # diff the binary & star namelists against the defaults in a single pass
+                allOptions = self.__get_non_default_values_for_namelists__(
+                    Options=self._MESAOptions,
+                    namelists=mesa_namelists.binary_namelists + mesa_namelists.star_namelists,
                 )
 
                 # for these, we need to set up inlist(1) & inlist(2) if not present already
-                if "inlist_names(1)" not in mesabinaryOptions["binary_job"]:
-                    mesabinaryOptions["binary_job"]["inlist_names(1)"] = "inlist1"
-                if "inlist_names(2)" not in mesabinaryOptions["binary_job"]:
-                    mesabinaryOptions["binary_job"]["inlist_names(2)"] = "inlist2"
+                if "inlist_names(1)" not in allOptions["binary_job"]:
+                    allOptions["binary_job"]["inlist_names(1)"] = "inlist1"
+                if "inlist_names(2)" not in allOptions["binary_job"]:
+                    allOptions["binary_job"]["inlist_names(2)"] = "inlist2"
 
-                self.namelists_for_template = self.__pop_empty_namelists__(d=mesabinaryOptions)
-
-                starOptions = self.__get_non_default_values_for_namelists__(
-                    Options=self._MESAOptions, namelists=mesa_namelists.star_namelists
-                )
+                # only the empty binary namelists are dropped. empty star namelists must stay:
+                # the `inlist` file points MESA at them inside `inlist_project`
+                for namelist in mesa_namelists.binary_namelists:
+                    if namelist in allOptions and len(allOptions[namelist]) == 0:
+                        del allOptions[namelist]
 
-                self.namelists_for_template.update(starOptions)
+                self.namelists_for_template = allOptions
 
             else:
                 logger.critical(
@@ -466,36 +591,13 @@ class MESAmodel:
     def set_run_namelists(self) -> None:
         """Create namelists with options that change for different MESA runs"""
 
-        def replace_run_string_in_dict(d: Dict[Any, Any] = {}) -> Dict[Any, Any]:
-            """Replace a string with `template` in a key
-
-            Parameters
-            ----------
-            d : `dict`
-                Dictionary to search for the string to replace
-            """
-
-            for key, value in d.items():
-                try:
-                    if "#{run}" in d[key]:
-                        arr = value.split("/")
-                        value = f"{self.run_directory}/{arr[-1]}"
-                        d[key] = value
-                except TypeError:
-                    continue
-
-            return d
-
         logger.debug("setting run namelists")
 
+        namelists: Tuple[str, ...]
         if self.is_binary_evolution:
 
-            if self.model_id == "mesabinary" or self.model_id == "mesabin2dco":
-                mesabinaryOptions = self.__get_non_default_values_for_namelists__(
-                    Options=self.variables, namelists=mesa_namelists.binary_namelists
-                )
-
-                runOptions = mesabinaryOptions
+            if self.model_id in {"mesabinary", "mesabin2dco"}:
+                namelists = mesa_namelists.binary_namelists + mesa_namelists.star_namelists
 
             else:
                 logger.critical(
@@ -504,15 +606,13 @@ class MESAmodel:
                 sys.exit(1)
 
         else:
-            runOptions = dict()
+            namelists = mesa_namelists.star_namelists
 
-        # load options with MESAstar variable options
-        mesastarOptions = self.__get_non_default_values_for_namelists__(
-            Options=self.variables, namelists=mesa_namelists.star_namelists
+        # diff the variables of this run against the defaults in a single pass
+        runOptions = self.__get_non_default_values_for_namelists__(
+            Options=self.variables, namelists=namelists
         )
 
-        runOptions.update(mesastarOptions)
-
         # once all run options are set, remove empty elements in dictionary and store it as the
         # namelists_for_run
         self.namelists_for_run = self.__pop_empty_namelists__(d=runOptions)
@@ -521,10 +621,10 @@ class MESAmodel:
         self,
         copy_default_workdir: bool = True,
         replace: bool = True,
-        extra_src_folders: List[str] = [],
-        extra_src_files: List[str] = [],
-        extra_makefile: List[str] = [],
-        extra_template_files: List[str] = [],
+        extra_src_folders: Optional[List[str]] = None,
+        extra_src_files: Optional[List[str]] = None,
+        extra_makefile: Optional[List[str]] = None,
+        extra_template_files: Optional[List[str]] = None,
     ) -> None:
         """Create and copy files and folders to template root
 
@@ -552,22 +652,23 @@ class MESAmodel:
 
         logger.debug("creating template structure")
 
-        # to replace, first we remove everything from the template folder
-        if replace:
-            items = self.template_directory.glob("*")
-            for item in items:
-                if item.is_file():
-                    item.unlink()
-                else:
-                    rmtree(item)
-
-        # create folders in template directory
+        # to replace, the old template folder is moved aside with a single rename (atomic and
+        # O(1) no matter how many files it holds) and removed in the background while the new
+        # template is being built
+        if replace and self.template_directory.is_dir():
+            old_directory = self.template_directory.with_name(f"{self.template_directory.name}.old")
+            if old_directory.is_dir():
+                # leftover of an interrupted earlier swap, drop it before renaming
+                rmtree(old_directory, ignore_errors=True)
+            os.rename(self.template_directory, old_directory)
+            threading.Thread(
+                target=rmtree, args=(old_directory,), kwargs={"ignore_errors": True}, daemon=True
+            ).start()
+
+        # create folders in template directory (exist_ok saves the stat-then-mkdir round trip)
         for name in self._defaultFolderNames:
             folder_name = self.template_directory / name
-            if not folder_name.is_dir():
-                folder_name.mkdir(parents=True)
-            else:
-                logger.error(f"could not copy folder {folder_name}. folder not found")
+            folder_name.mkdir(parents=True, exist_ok=True)
 
         if copy_default_workdir:
             # set some useful variable names for copy stuff to src folder of template directory
@@ -621,12 +722,13 @@ class MESAmodel:
 
                     output_folder = self.template_directory / "src" / module_name
                     if folder_name.is_dir():
-                        copytree(folder_name, output_folder)
+                        # copyfile skips the per-file metadata copy of the default copy2
+                        copytree(folder_name, output_folder, copy_function=copyfile)
                     else:
                         logger.error(f"could not copy folder {folder_name}. folder not found")
 
         # create folders inside src/
-        if len(extra_src_folders) > 0:
+        if extra_src_folders:
             for name in extra_src_folders:
                 folder_name = self.template_directory / "src" / name
                 if not folder_name.is_dir():
@@ -638,13 +740,12 @@ class MESAmodel:
                             p.unlink()
 
         # try to copy extra files
-        if len(extra_src_files) > 0:
+        if extra_src_files:
             for file in extra_src_files:
                 output_folder = self.template_directory / "src"
-                filename_stripped = file.split("/")[-1]
                 filepath = Path(file)
                 if filepath.is_file():
-                    output_file = output_folder / Path(filename_stripped)
+                    output_file = output_folder / filepath.name
                     copyfile(filepath, output_file)
                 else:
                     print(f"could not copy file {filepath}. file not found")
@@ -652,7 +753,7 @@ class MESAmodel:
                     print(f"file {str(filepath)} is not a fortran file. copying either way")
 
         # extra files in the make folder
-        if len(extra_makefile):
+        if extra_makefile:
             for file in extra_makefile:
                 output_folder = self.template_directory / "make"
                 filepath = Path(file)
@@ -664,16 +765,14 @@ class MESAmodel:
 
         # copy extra files for the template directory. e.g., the *.list files with what will be
         # saved in MESA output
-        if len(extra_template_files) > 0:
+        if extra_template_files:
             for file in extra_template_files:
                 output_folder = self.template_directory
 
-                # split by "/" and get the name from the last item
-                filename = str(file).split("/")[-1]
-
                 filepath = Path(file)
                 if filepath.is_file():
-                    output_file = output_folder / filename
+                    # the last path component gives the name in the template
+                    output_file = output_folder / filepath.name
                     copyfile(filepath, output_file)
                 else:
                     print(f"could not copy file {filepath}. file not found")
@@ -683,8 +782,7 @@ class MESAmodel:
 
         logger.debug("creating run structure")
 
-        if not self.run_directory.is_dir():
-            self.run_directory.mkdir(parents=True)
+        self.run_directory.mkdir(parents=True, exist_ok=True)
 
     def compile_template(self) -> None:
         """Compile source code of MESA run"""
@@ -706,12 +804,11 @@ class MESAmodel:
         mesa_env_vars_string += f"export MESASDK_ROOT={self.mesasdk_dir}; "
         mesa_env_vars_string += f"source $MESASDK_ROOT/bin/mesasdk_init.sh"
 
-        # compile MESA source code
+        # compile MESA source code. passing an argv list (instead of shell=True) lets the
+        # subprocess module use its fast vfork/posix_spawn path when starting bash
         try:
             p = subprocess.Popen(
-                f"{mesa_env_vars_string}; chmod +x mk; ./mk",
-                shell=True,
-                executable="/bin/bash",
+                ["/bin/bash", "-c", f"{mesa_env_vars_string}; chmod +x mk; ./mk"],
                 cwd=self.template_directory,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
@@ -739,11 +836,7 @@ class MESAmodel:
             folder_name = self.template_directory
 
             # also get names of files
-            if (
-                self.model_id == "mesabinary"
-                or self.model_id == "mesastar"
-                or self.model_id == "mesabin2dco"
-            ):
+            if self.model_id in {"mesabinary", "mesastar", "mesabin2dco"}:
                 inlist_fname = folder_name / self._defaultInitInlistName
                 inlist_project_fname = folder_name / self._defaultProjectInlistName
 
@@ -753,122 +846,103 @@ class MESAmodel:
                 )
                 sys.exit(1)
 
-            # first, create `inlist` file
-            inlist_file_string = ""
-            for key in self.namelists_for_init.keys():
-                inlist_file_string += dump_dict_to_namelist_string(
-                    data=self.namelists_for_init[key], namelist=key, array_inline=False
+            # first, create `inlist` file. collect parts & join once: linear cost instead of
+            # the quadratic re-allocation of += on a growing string, then a single write
+            inlist_fname.write_text(
+                "".join(
+                    dump_dict_to_namelist_string(
+                        data=self.namelists_for_init[key], namelist=key, array_inline=False
+                    )
+                    for key in self.namelists_for_init.keys()
                 )
-            # save to file
-            with open(inlist_fname, "w") as f:
-                f.write(inlist_file_string)
+            )
 
             # second, create `inlist_project` file
-            inlist_project_file_string = ""
-            for key in self.namelists_for_template.keys():
-                inlist_project_file_string += dump_dict_to_namelist_string(
-                    data=self.namelists_for_template[key],
-                    namelist=key,
-                    array_inline=False,
+            inlist_project_fname.write_text(
+                "".join(
+                    dump_dict_to_namelist_string(
+                        data=self.namelists_for_template[key],
+                        namelist=key,
+                        array_inline=False,
+                    )
+                    for key in self.namelists_for_template.keys()
                 )
-            # save to file
-            with open(inlist_project_fname, "w") as f:
-                f.write(inlist_project_file_string)
+            )
 
         elif name_id == "run":
-            # make a copy of namelists_for_run to save items for each stars differently
-            data = self.namelists_for_run.copy()
-            data1 = self.namelists_for_run.copy()
-            data2 = self.namelists_for_run.copy()
-
             # set names
             folder_name = self.run_directory
 
+            run_namelists = self.namelists_for_run
+
             # save files to MESAbinary or MESAbin2dco run folder
-            if self.model_id == "mesabinary" or self.model_id == "mesabin2dco":
+            if self.model_id in {"mesabinary", "mesabin2dco"}:
                 inlist_binary_run_fname = folder_name / self._defaultBinaryRunInlistName
                 inlist_star1_run_fname = folder_name / self._defaultStar1RunInlistName
                 inlist_star2_run_fname = folder_name / self._defaultStar2RunInlistName
 
-                # patch to add names of different folders for two stars
-                if "controls" not in data1:
-                    data1["controls"] = dict()
-                if "controls" not in data2:
-                    data2["controls"] = dict()
-                if "log_directory" not in data1["controls"]:
-                    data1["controls"]["log_directory"] = "LOGS1"
-                if "log_directory" not in data2["controls"]:
-                    data2["controls"]["log_directory"] = "LOGS2"
-
-                # another patch, MESA needs pgstar namelist in its inlist1 and inlist2, else
-                # it breaks
-                if "pgstar" not in data1:
-                    data1["pgstar"] = dict()
-                if "pgstar" not in data2:
-                    data2["pgstar"] = dict()
-
-                # patch to add call to inlist_project file from inside inlist_star1 and inlist_star2 files
-                for namelist in mesa_namelists.star_namelists:
-                    if (
-                        namelist in self.namelists_for_template
-                        and len(self.namelists_for_template.get(namelist)) > 0  # type: ignore
-                    ):
-                        if namelist not in data1:
-                            data1[namelist] = dict()
-                        if namelist not in data2:
-                            data2[namelist] = dict()
-                        data1[namelist][f"read_extra_{namelist}_inlist1"] = True
-                        data2[namelist][f"read_extra_{namelist}_inlist1"] = True
-                        data1[namelist][
-                            f"extra_{namelist}_inlist1_name"
-                        ] = f"{self.template_directory}/{self._defaultProjectInlistName}"
-                        data2[namelist][
-                            f"extra_{namelist}_inlist1_name"
-                        ] = f"{self.template_directory}/{self._defaultProjectInlistName}"
-
-                # create string with namelists. one for each needed: binary, star1 & star2
-                inlist_binary_file_string = ""
-                inlist1_star_file_string = ""
-                inlist2_star_file_string = ""
-                for key in data:
-                    if key in mesa_namelists.binary_namelists:
-                        inlist_binary_file_string += dump_dict_to_namelist_string(
-                            data=data[key], namelist=key, array_inline=False
-                        )
-                for key in data1:
-                    if key in mesa_namelists.star_namelists:
-                        inlist1_star_file_string += dump_dict_to_namelist_string(
-                            data=data1[key], namelist=key, array_inline=False
-                        )
-                for key in data2:
-                    if key in mesa_namelists.star_namelists:
-                        inlist2_star_file_string += dump_dict_to_namelist_string(
-                            data=data2[key], namelist=key, array_inline=False
+                # per-star additions are collected in small overlay dicts that get merged at
+                # emit time. the shallow copies used before shared the inner namelist dicts,
+                # so patching star 1 leaked into star 2 (both stars ended up with LOGS1) and
+                # permanently mutated namelists_for_run
+
+                # patch to add names of different folders for the two stars. MESA also needs
+                # the pgstar namelist in its inlist1 and inlist2, else it breaks
+                overlay1: Dict[Any, Dict[Any, Any]] = {"controls": dict(), "pgstar": dict()}
+                overlay2: Dict[Any, Dict[Any, Any]] = {"controls": dict(), "pgstar": dict()}
+                if "log_directory" not in run_namelists.get("controls", {}):
+                    overlay1["controls"]["log_directory"] = "LOGS1"
+                    overlay2["controls"]["log_directory"] = "LOGS2"
+
+                # patch to add call to inlist_project file from inside inlist1 and inlist2
+                # files. it only depends on the shared template, so it is memoized across
+                # all models of the grid
+                patch = _star_inlist_patch(
+                    self._template_dir_str,
+                    tuple(
+                        namelist
+                        for namelist in mesa_namelists.star_namelists
+                        if len(self.namelists_for_template.get(namelist) or ()) > 0
+                    ),
+                    self._defaultProjectInlistName,
+                )
+                for namelist, extras in patch.items():
+                    overlay1.setdefault(namelist, dict()).update(extras)
+                    overlay2.setdefault(namelist, dict()).update(extras)
+
+                def star_inlist_string(overlay: Dict[Any, Dict[Any, Any]]) -> str:
+                    return "".join(
+                        _dump_namelist_cached(
+                            data={**run_namelists.get(key, {}), **overlay.get(key, {})},
+                            namelist=key,
                         )
-
-                # save to files
-                with open(inlist_binary_run_fname, "w") as f:
-                    f.write(inlist_binary_file_string)
-                with open(inlist_star1_run_fname, "w") as f:
-                    f.write(inlist1_star_file_string)
-                with open(inlist_star2_run_fname, "w") as f:
-                    f.write(inlist2_star_file_string)
+                        for key in mesa_namelists.star_namelists
+                        if key in run_namelists or key in overlay
+                    )
+
+                # create string with namelists, one for each needed (binary, star1 & star2),
+                # joining the parts once and writing each file with a single call
+                inlist_binary_run_fname.write_text(
+                    "".join(
+                        _dump_namelist_cached(data=run_namelists[key], namelist=key)
+                        for key in run_namelists
+                        if key in _BINARY_NAMELISTS
+                    )
+                )
+                inlist_star1_run_fname.write_text(star_inlist_string(overlay1))
+                inlist_star2_run_fname.write_text(star_inlist_string(overlay2))
 
             elif self.model_id == "mesastar":
-                # make a copy of namelists to save items
-                data = self.namelists_for_run.copy()
                 inlist_star_run_fname = folder_name / self._defaultStarRunInlistName
 
-                inlist_star_file_string = ""
-                for key in data:
-                    if key in self._defaultStarNamelists:  # type: ignore
-                        inlist_star_file_string = dump_dict_to_namelist_string(
-                            data=data[key], namelist=key, array_inline=False
-                        )
-
                 # save namelists to file
-                with open(inlist_star_run_fname, "w") as f:
-                    f.write(inlist_star_file_string)
+                inlist_star_run_fname.write_text(
+                    "".join(
+                        _dump_namelist_cached(data=run_namelists[key], namelist=key)
+                        for key in run_namelists
+                        if key in _STAR_NAMELISTS
+                    )
+                )
 
             else:
                 logger.critical(f"{self.model_id}: unknown id for creating run of binary namelists")
@@ -878,7 +952,7 @@ class MESAmodel:
             logger.critical(f"{name_id} is not a valid option")
             sys.exit(1)
 
-    def copy_column_list_files(self, filenames: List[str] = []) -> None:
+    def copy_column_list_files(self, filenames: Optional[List[str]] = None) -> None:
         """Copy column list file with the columns that will be saved in a MESA run
 
         Parameters
@@ -894,7 +968,7 @@ class MESAmodel:
         _binary_history_filename = "binary_history_columns.list"
 
         # in case nothing is sent, simply copy the default files of the MESA source code
-        if len(filenames) == 0:
+        if not filenames:
             # first, copy the mesastar files: history & profile lists
             profile_infile = self.mesa_dir / "star/defaults" / _profile_filename
             history_infile = self.mesa_dir / "star/defaults" / _history_filename
@@ -913,7 +987,6 @@ class MESAmodel:
 
         else:
             for file in filenames:
-                _fname = str(file).split("/")[-1]
-                outfile = self.template_directory / _fname
                 infile = Path(file)
+                outfile = self.template_directory / infile.name
                 copyfile(infile, outfile)
@@ -1,13 +1,21 @@
 """Module with utils functions and classes for a MESA model
 """
 
-from typing import Any, Dict, Tuple, Union
+from typing import Any, Dict, List, Optional, Union
 
+import hashlib
 import os
+import pickle
+import sys
 from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 
-import numpy as np
+# folder for the on-disk cache of parsed MESA defaults (see `get_mesa_defaults`)
+if "XDG_CACHE_HOME" in os.environ:
+    _DEFAULTS_CACHE_DIR = Path(os.environ["XDG_CACHE_HOME"]) / "stevma"
+else:
+    _DEFAULTS_CACHE_DIR = Path.home() / ".cache" / "stevma"
 
 from stevma.io import parse_fortran_value_to_python
 
@@ -106,22 +114,22 @@ def namelist_defaults(fname: Union[str, Path]) -> Dict[Any, Any]:
     if not fname.is_file():
         raise FileNotFoundError(f"`{fname}` not found")
 
+    # stream the file and cut each line with partition, which splits at most once in C;
+    # a plain dict preserves insertion order and inserts faster than OrderedDict
+    options: Dict[Any, Any] = dict()
     with open(fname) as f:
-        lines = [line.strip() for line in f.readlines() if len(line) > 0]
-
-    options = OrderedDict()
-    for k, line in enumerate(lines):
-        if not line.startswith("!") and "=" in line:
-            line = line.split("!", 1)[0]
-
-            if len(line.split("=")) < 2:
-                raise ValueError(f"error in line: {line}")
-            elif len(line.split("=")) > 2:  # there is just one string in the defaults with two '='
-                name, lval, rval = line.split("=")
-                value = f"{lval}={rval}"
-            else:
-                name, value, *extra_words = line.split("=")
-
+        for raw in f:
+            line = raw.strip()
+            if not line or line.startswith("!"):
+                continue
+
+            code, _, _ = line.partition("!")
+            name, sep, value = code.partition("=")
+            if not sep:
+                continue
+
+            # note: partition keeps everything after the first `=` in `value`, so the one
+            # defaults option whose value itself contains a `=` is handled naturally
             options[name.strip()] = parse_fortran_value_to_python(value=value.strip())
 
     return options
@@ -130,6 +138,10 @@ def namelist_defaults(fname: Union[str, Path]) -> Dict[Any, Any]:
 def get_mesa_defaults(mesa_dir: Union[str, Path] = "") -> Dict[Any, Any]:
     """Obtain all default options of every namelist used by MESA
 
+    Results are cached per MESA installation: parsing the tree of `*.defaults` files is
+    expensive and every model in a meshgrid shares the same installation, so only the first
+    call pays the parsing cost. The returned dictionary is shared and must not be mutated
+
     Parameters
     ----------
     mesa_dir : `str / Path`
@@ -148,17 +160,38 @@ def get_mesa_defaults(mesa_dir: Union[str, Path] = "") -> Dict[Any, Any]:
                 "`mesa_dir` cannot be empty. also it was not find in the environment variable list"
             )
 
-    # use pathlib
-    if isinstance(mesa_dir, str):
-        mesa_dir = Path(mesa_dir)
+    # normalize to an absolute path string so `str` and `Path` arguments share a cache entry
+    return _get_mesa_defaults_cached(os.path.abspath(str(mesa_dir)))
+
 
-    # load namelists for each MESA module
+def _intern_defaults(MESADefaults: Dict[Any, Any]) -> Dict[Any, Any]:
+    """Intern every option name (in place) so all models share one string object per control
+
+    Tens of thousands of short control names are looked up over and over when building a grid;
+    interned keys make those dictionary probes pointer-identity hits and deduplicate the memory
+    of repeated keys
+    """
+
+    for namelist, options in MESADefaults.items():
+        MESADefaults[namelist] = OrderedDict(
+            (sys.intern(key), value) for key, value in options.items()
+        )
+
+    return MESADefaults
+
+
+@lru_cache(maxsize=None)
+def _get_mesa_defaults_cached(mesa_dir: str) -> Dict[Any, Any]:
+    """Parse all MESA defaults below `mesa_dir` (see `get_mesa_defaults`)"""
+
+    # load namelists for each MESA module & locate the defaults file of each one
     mesaNamelists = MESANamelists()
 
-    MESADefaults = dict()
-    if "bin2dco" in str(mesa_dir):
-        fname = mesa_dir / f"src/bin2dco_controls.defaults"
-        MESADefaults["bin2dco_controls"] = namelist_defaults(fname=fname)
+    mesa_path = Path(mesa_dir)
+
+    defaults_fnames = OrderedDict()
+    if "bin2dco" in mesa_dir:
+        defaults_fnames["bin2dco_controls"] = mesa_path / "src/bin2dco_controls.defaults"
 
     else:
         for namelist in mesaNamelists.star_namelists:
@@ -169,18 +202,81 @@ def get_mesa_defaults(mesa_dir: Union[str, Path] = "") -> Dict[Any, Any]:
             if "kap" in namelist:
                 folder_name = "kap"
 
-            fname = mesa_dir / f"{folder_name}/defaults/{namelist}.defaults"
-            MESADefaults[namelist] = namelist_defaults(fname=fname)
+            defaults_fnames[namelist] = mesa_path / f"{folder_name}/defaults/{namelist}.defaults"
 
         for namelist in mesaNamelists.binary_namelists:
             folder_name = "binary"
-            fname = mesa_dir / f"{folder_name}/defaults/{namelist}.defaults"
-            MESADefaults[namelist] = namelist_defaults(fname=fname)
+            defaults_fnames[namelist] = mesa_path / f"{folder_name}/defaults/{namelist}.defaults"
+
+    # a pickle cache keyed on the installation path and the newest mtime of its defaults files
+    # turns cold starts (new processes) into a single binary load instead of a full re-parse
+    cache_fname = None
+    mtimes = [fname.stat().st_mtime_ns for fname in defaults_fnames.values() if fname.is_file()]
+    if DISK_CACHE_ENABLED and len(mtimes) > 0:
+        key = hashlib.blake2b(mesa_dir.encode()).hexdigest()[:16]
+        cache_fname = _DEFAULTS_CACHE_DIR / f"mesa_defaults_{key}_{max(mtimes)}.pkl"
+        if cache_fname.is_file():
+            try:
+                with open(cache_fname, "rb") as f:
+                    return _intern_defaults(pickle.load(f))
+            except Exception:
+                # a corrupt/unreadable cache file is no reason to fail; just re-parse
+                pass
+
+    MESADefaults = dict()
+    for namelist, fname in defaults_fnames.items():
+        MESADefaults[namelist] = namelist_defaults(fname=fname)
+    _intern_defaults(MESADefaults)
+
+    if cache_fname is not None:
+        try:
+            _DEFAULTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            # dump to a sidecar file and rename it into place, so a concurrent process can
+            # never observe a partially written cache
+            tmp_fname = cache_fname.with_suffix(".tmp")
+            with open(tmp_fname, "wb") as f:
+                pickle.dump(MESADefaults, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_fname, cache_fname)
+        except OSError:
+            pass
 
     return MESADefaults
 
 
-def split_grid(number_of_grids: int = 1, Grid: Dict[Any, Any] = {}) -> Dict[str, Dict[Any, Any]]:
+def get_mesa_option_index(mesa_dir: Union[str, Path] = "") -> Dict[str, str]:
+    """Map every MESA option name to the namelist that owns it
+
+    The index is derived from `get_mesa_defaults` and cached alongside it, so classifying an
+    option becomes a single dictionary lookup instead of a scan over every namelist
+
+    Parameters
+    ----------
+    mesa_dir : `str / Path`
+        Path to MESA source folder. also found in shell as MESA_DIR environment variable
+
+    Returns
+    -------
+    option_index : `dict`
+        Dictionary mapping option names to namelist names
+    """
+
+    return _get_mesa_option_index_cached(os.path.abspath(str(mesa_dir)))
+
+
+@lru_cache(maxsize=None)
+def _get_mesa_option_index_cached(mesa_dir: str) -> Dict[str, str]:
+    """Invert the MESA defaults of `mesa_dir` (see `get_mesa_option_index`)"""
+
+    MESADefaults = _get_mesa_defaults_cached(mesa_dir)
+
+    return {option: namelist for namelist, options in MESADefaults.items() for option in options}
+
+
+# toggle for the on-disk defaults cache, cleared by the `--no-cache` command-line flag
+DISK_CACHE_ENABLED = True
+
+
+def split_grid(number_of_grids: int = 1, Grid: Optional[List[Any]] = None) -> List[Any]:
     """Split grid into smaller subgrids
 
     Parameters
@@ -188,33 +284,33 @@ def split_grid(number_of_grids: int = 1, Grid: Dict[Any, Any] = {}) -> Dict[str,
     number_of_grids : `int`
         Number of subgrids to split grid
 
-    grid : `dict`
-        Dictionary with complete meshgrid points
+    grid : `list`
+        List with complete meshgrid points
 
     Returns
     -------
-    subgrids : `dict`
-        Dictionary with smaller grids
+    subgrids : `list`
+        List with smaller grids
     """
 
     if number_of_grids <= 0:
         raise ValueError(f"number_of_grids cannot be lower than 0: {number_of_grids}")
 
-    if len(Grid) == 0:
+    if Grid is None or len(Grid) == 0:
         raise ValueError(f"Grid cannot be 0: {Grid}")
 
     # force number_of_grids to be an integer
     number_of_grids = int(number_of_grids)
 
-    # create array with number of elements
-    elements_in_grid = np.arange(len(Grid))
-
-    # create array in which each element in another array of indexes
-    array_of_indexes = np.array_split(elements_in_grid, number_of_grids)
-
-    for k, arr in enumerate(array_of_indexes):
-        for j in arr:
-            Grid[f"{j}"]["job_id"] = k
+    # partition the contiguous range of identifiers into (almost) equal chunks: the first
+    # `r` subgrids get one extra element, matching what np.array_split used to produce
+    q, r = divmod(len(Grid), number_of_grids)
+    start = 0
+    for k in range(number_of_grids):
+        size = q + (1 if k < r else 0)
+        for j in range(start, start + size):
+            Grid[j].job_id = k
+        start += size
 
     return Grid
 
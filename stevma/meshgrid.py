@@ -6,15 +6,19 @@ Each of them present in the dictionary is a dictionary in itself, such that the
 are varied in the grid are keys of them and should contain lists or numbers or booleans\
 """
 
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
-import numpy as np
+import itertools
+import logging
+import math
 
 from stevma.io import logger
 from stevma.mesa import get_mesa_defaults, mesa_namelists
 
 
-def check_for_valid_namelist_options(d: Dict[Any, Any] = {}, mesa_dir: str = "") -> bool:
+def check_for_valid_namelist_options(
+    d: Optional[Dict[Any, Any]] = None, mesa_dir: str = ""
+) -> bool:
     """Function that checks whether a dictionary contains valid namelists of MESA as well
     as valid name of options
 
@@ -30,33 +34,37 @@ def check_for_valid_namelist_options(d: Dict[Any, Any] = {}, mesa_dir: str = "")
         valid MESA namelist or option
     """
 
+    if d is None:
+        d = {}
+
     # need MESA defaults parameters to check whether the arguments of the meshgrid are valid
     _MESADefaults = get_mesa_defaults(mesa_dir=mesa_dir)
 
-    # check that each key in the dict grid is actually a valid namelist
-    namelists = [namelist for namelist in mesa_namelists.star_namelists]
-    namelists.extend([namelist for namelist in mesa_namelists.binary_namelists])
+    # check that each key in the dict grid is actually a valid namelist. a set gives O(1)
+    # membership tests, and every violation is reported instead of stopping at the first one
+    valid_namelists = set(mesa_namelists.star_namelists) | set(mesa_namelists.binary_namelists)
 
     is_okay = True
-    for key in d.keys():
-        if key not in namelists:
-            logger.critical(f"namelist `{key}` not present in MESA source code")
+    for key, options in d.items():
+        if key not in valid_namelists:
+            logger.critical("namelist `%s` not present in MESA source code", key)
+            is_okay = False
+            continue
+
+        # a single set difference replaces one membership scan per option
+        unknown_options = options.keys() - _MESADefaults[key].keys()
+        for subkey in unknown_options:
+            logger.critical("option `%s` not valid (not found in MESA defaults)", subkey)
+        if unknown_options:
             is_okay = False
-            break
-        else:
-            tmpDict = d[key]
-            for subkey in tmpDict.keys():
-                if subkey not in _MESADefaults.get(key):  # type: ignore
-                    logger.critical(f"option `{subkey}` not valid (not found in MESA defaults)")
-                    is_okay = False
-                    break
 
     return is_okay
 
 
 def create_meshgrid_from_dict(
-    d: Dict[Any, Dict[str, Any]] = {}, conditions: List[Callable[..., bool]] = []
-) -> Dict[Any, Any]:
+    d: Optional[Dict[Any, Dict[str, Any]]] = None,
+    conditions: Optional[List[Callable[..., bool]]] = None,
+) -> List[Dict[str, Any]]:
     """Function that creates the meshgrid from a dictionary
 
     Parameters
@@ -66,71 +74,52 @@ def create_meshgrid_from_dict(
 
     Returns
     -------
-    meshgrid : `dict`
-        Dictionary with the meshgrid
+    meshgrid : `list`
+        List with the meshgrid elements; the position of each element is its identifier
     """
 
+    if d is None:
+        d = {}
+
     # get number of possible gridpoints (might be reduced later on)
     estimated_number_gridpoints = get_number_of_gridpoints(d)
-    logger.debug(f"estimated number of gridpoints: {estimated_number_gridpoints}")
-
-    # generate a list of identifiers based on the number of gridpoints. it starts with 0 and goes
-    # up to (estimated_number_gridpoints - 1)
-    identifiers = range(estimated_number_gridpoints)
-
-    # dictionary that contains the actual runs, each key is a different run
-    meshgrid: Dict[Any, Any] = dict()
-    for k in identifiers:
-        meshgrid.update({f"{k}": dict()})
-
-    # create a tmp dict without namelists, but use them separately
-    tmpDict = dict()
-    option_names = []
-    for namelist in d.keys():
-        namelist_options = d.get(namelist)
-        for option in namelist_options.keys():  # type: ignore
-            option_names.append(option)
-
-            values = namelist_options[option]  # type: ignore
-            if not isinstance(values, list):
-                try:
-                    values = [values]
-                except Exception as e:
-                    logger.critical(f"{e}")
-
-            tmpDict[option] = values
-
-    # once the dictionary is set, use numpy to create the meshgrid
-    tmpGrid = np.asarray(np.meshgrid(*list(tmpDict.values())))
-    grid = np.column_stack([element.flatten() for element in tmpGrid])
-    logger.debug(f"number of elements in the grid: {len(grid)}")
-
-    # each element in the grid is then separated into different dictionaries, one for each case
-    for k in range(len(grid)):
-        row = grid[k]
-        for j, name in enumerate(option_names):
-            meshgrid.get(f"{k}").update({option_names[j]: row[j]})  # type: ignore
-        logger.debug(f"meshgrid element ({k}): {meshgrid.get(f'{k}')}")
-
-    # now we check some important stuff for binary evolution such as to avoid repeting simulations
-    if len(conditions) > 0:
-        keys_to_pop = []  # keys to remove from meshgrid are stored in this array
-        for key in meshgrid.keys():
-            tmpDict = meshgrid.get(key)  # type: ignore
-            for k, condition in enumerate(conditions):
-                if condition(tmpDict):
-                    logger.debug(f"failed condition {k}: going to remove index {key} from meshgrid")
-                    keys_to_pop.append(f"{key}")
-
-        # pop keys that do not fulfill condition
-        if len(keys_to_pop) > 0:
-            for key in keys_to_pop:
-                meshgrid.pop(key)
+    logger.debug("estimated number of gridpoints: %d", estimated_number_gridpoints)
+
+    # create a tmp dict without namelists, normalizing every value to a tuple in one pass
+    # (scalars become 1-tuples, so the product below needs no special cases)
+    tmpDict = {
+        option: tuple(values) if isinstance(values, (list, tuple)) else (values,)
+        for namelist_options in d.values()
+        for option, values in namelist_options.items()
+    }
+    option_names = list(tmpDict)
+
+    # stream the cartesian product of every option: each combination is produced lazily, one at
+    # a time, instead of materializing the full (gridpoints x options) array in memory at once.
+    # this also keeps the native python type of each value (no upcasting to a common dtype).
+    # conditions (e.g. to avoid repeating binary simulations) are evaluated in the same pass,
+    # so rejected combinations are never inserted and survivors get consecutive identifiers,
+    # which lets the grid live in a plain list indexed by the identifier itself
+    meshgrid: List[Dict[str, Any]] = []
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    for row in itertools.product(*tmpDict.values()):
+        entry = dict(zip(option_names, row))
+
+        if conditions and any(condition(entry) for condition in conditions):
+            if debug_enabled:
+                logger.debug("failed a condition: skipping combination %s", entry)
+            continue
+
+        if debug_enabled:
+            logger.debug("meshgrid element (%d): %s", len(meshgrid), entry)
+        meshgrid.append(entry)
+
+    logger.debug("number of elements in the grid: %d", len(meshgrid))
 
     return meshgrid
 
 
-def get_number_of_gridpoints(d: Dict[Any, Any] = {}) -> int:
+def get_number_of_gridpoints(d: Optional[Dict[Any, Any]] = None) -> int:
     """Get the number of points in the meshgrid
 
     Parameters
@@ -143,16 +132,15 @@ def get_number_of_gridpoints(d: Dict[Any, Any] = {}) -> int:
     n : `int`
         Number of models to evolve with the stellar evolutionary code
     """
-    n = 1
-
-    # we assume that there dictionary has one key with the namelist of MESA
-    # which is in itself another dictionary with the actual gridpoints
-    for namelist in d.keys():
-        options = d[namelist]
-        for option in options.keys():
-            if isinstance(options[option], list):
-                n *= len(options[option])
-            else:
-                logger.debug(f"{option} contains only one element")
-
-    return n
+    if d is None:
+        d = {}
+
+    # we assume that the dictionary has one key with the namelist of MESA
+    # which is in itself another dictionary with the actual gridpoints.
+    # scalar options contribute a factor of 1 and are simply skipped
+    return math.prod(
+        len(values)
+        for options in d.values()
+        for values in options.values()
+        if isinstance(values, list)
+    )